@@ -15,6 +15,8 @@ FIELD_TYPE_PSWD        = 0x00000080
 FIELD_TYPE_UNSIGNED    = 0x40000000
 FIELD_TYPE_NOT_NULL    = 0x80000000
 
+FIELD_TYPE_MASK        = 0x3fffffff
+
 
 # Index Type Constants
 #=====================
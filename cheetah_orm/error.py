@@ -22,3 +22,8 @@ class InvalidParamsError(ORMError):
 class InvalidTypeError(ORMError):
     """Invalid column type."""
     pass
+
+
+class MissingDriverError(ORMError):
+    """Missing database driver."""
+    pass
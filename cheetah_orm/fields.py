@@ -10,24 +10,78 @@ length   - sets the maximum length of the field (used by IntField, BigIntField,
 unsigned - makes the field unsigned (used by IntField, BigIntField, FloatField, and DoubleField)
 not_null - prevents the field from being null
 
+The password field also accepts a "rounds" keyword argument which sets the number of PBKDF2 rounds used
+when hashing new passwords (defaults to passlib's recommended value).
+
+
+Assigning the NOW constant (or the string "now()") to a datetime field stores the current date and time.
+NOW avoids the string comparison and should be preferred when setting many values.
 
 The password field automatically hashes any password you store into it and fetching its value gives you
 the hash as a password object rather than the original password. The returned password object can be
-verified against an unhashed password via the normal equality operator "==".
+verified against an unhashed password via the normal equality operator "==". Passwords can also be hashed
+ahead of time with the "hash" or "hash_many" methods of the field. They return password objects which can
+then be assigned to the field without being hashed again, as can password objects fetched from another data
+model. Strings are always treated as unhashed passwords.
+Since hashing releases the GIL, "hash_many" hashes the given passwords in parallel on a thread pool.
 """
 
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+import hashlib
+import hmac
 
 from passlib.hash import pbkdf2_sha256
+from passlib.utils.binary import ab64_decode
 
 from .constants import *
 
 
+# Functions
+# =========
+@lru_cache(maxsize=1024)
+def _parse_pbkdf2_sha256(hash):
+    """Parse a PBKDF2-SHA256 hash into its rounds, salt, and checksum.
+
+    Returns None if the hash isn't a well-formed PBKDF2-SHA256 hash.
+    """
+    try:
+        if isinstance(hash, bytes):
+            hash = hash.decode()
+
+        parts = hash.split("$")
+
+        if len(parts) != 5 or parts[1] != "pbkdf2-sha256":
+            return None
+
+        return int(parts[2]), ab64_decode(parts[3]), ab64_decode(parts[4])
+
+    except ValueError:
+        return None
+
+
 # Classes
 # =======
+class _Now(object):
+    """Sentinel for the current date and time."""
+    __slots__ = ()
+
+    def __repr__(self):
+        """Return the string representation of this sentinel."""
+        return "NOW"
+
+
+NOW = _Now()
+
+
 class Field(object):
     """Base class for a field."""
+    __slots__ = ("default", "length", "flags", "name", "index")
+
+    field_type     = 0
+    default_length = None   # None means length doesn't apply to the field type
+
     def __init__(self, **kwargs):
         """Setup this field."""
         self.default = kwargs.get("default")
@@ -46,198 +100,176 @@ class Field(object):
         """Store the field name for later use."""
         self.name = name
 
+    def _metadata(self):
+        """Return the metadata the parent data model stores for this field."""
+        length = (self.length or self.default_length) if self.default_length else None
+        return (self.name, self.field_type | self.flags, length, self.default)
+
     def __get__(self, obj, objtype=None):
         """Get the value of this field."""
-        return obj._data[self.name]
+        if obj is None:
+            return self
+
+        return obj._data[self.index]
     
     def __set__(self, obj, value):
-        """Set the value of this field."""
-        obj._data[self.name] = value
+        """Set the value of this field and mark it as changed."""
+        obj._data[self.index] = value
+        obj._dirty |= 1 << self.index
 
 
 class IntField(Field):
     """An integer field."""
-    def __set_name__(self, owner, name):
-        """Add the metadata for this field to the parent data model."""
-        super().__set_name__(owner, name)
-
-        # Create the model metadata if it doesn't exist
-        if not owner._fields:
-            owner._fields = []
+    __slots__ = ()
 
-        # Add this field to the model metadata
-        owner._fields.append((
-            name, 
-            FIELD_TYPE_INT | self.flags, 
-            self.length if self.length else 10, 
-            self.default
-        ))
+    field_type     = FIELD_TYPE_INT
+    default_length = 10
 
 
 class BigIntField(Field):
     """A big integer field."""
-    def __set_name__(self, owner, name):
-        """Add the metadata for this field to the parent data model."""
-        super().__set_name__(owner, name)
-
-        # Create the model metadata if it doesn't exist
-        if not owner._fields:
-            owner._fields = []
+    __slots__ = ()
 
-        # Add this field to the model metadata
-        owner._fields.append((
-            name, 
-            FIELD_TYPE_BIGINT | self.flags, 
-            self.length if self.length else 19, 
-            self.default
-        ))
+    field_type     = FIELD_TYPE_BIGINT
+    default_length = 19
 
 
 class FloatField(Field):
     """A float field."""
-    def __set_name__(self, owner, name):
-        """Add the metadata for this field to the parent data model."""
-        super().__set_name__(owner, name)
-
-        # Create the model metadata if it doesn't exist
-        if not owner._fields:
-            owner._fields = []
+    __slots__ = ()
 
-        # Add this field to the model metadata
-        owner._fields.append((
-            name, 
-            FIELD_TYPE_FLOAT | self.flags, 
-            None,             # length doesn't apply to this data type
-            self.default
-        ))
+    field_type = FIELD_TYPE_FLOAT
 
 
 class DoubleField(Field):
     """A double-precision float field."""
-    def __set_name__(self, owner, name):
-        """Add the metadata for this field to the parent data model."""
-        super().__set_name__(owner, name)
-
-        # Create the model metadata if it doesn't exist
-        if not owner._fields:
-            owner._fields = []
+    __slots__ = ()
 
-        # Add this field to the model metadata
-        owner._fields.append((
-            name, 
-            FIELD_TYPE_DOUBLE | self.flags, 
-            None,             # length doesn't apply to this data type
-            self.default
-        ))
+    field_type = FIELD_TYPE_DOUBLE
 
 
 class StringField(Field):
     """A string field."""
-    def __set_name__(self, owner, name):
-        """Add the metadata for this field to the parent data model."""
-        super().__set_name__(owner, name)
+    __slots__ = ()
 
-        # Create the model metadata if it doesn't exist
-        if not owner._fields:
-            owner._fields = []
-
-        # Add this field to the model metadata
-        owner._fields.append((
-            name, 
-            FIELD_TYPE_STRING | self.flags, 
-            self.length if self.length else 256, 
-            self.default
-        ))
+    field_type     = FIELD_TYPE_STRING
+    default_length = 256
 
 
 class BlobField(Field):
     """A blob field."""
-    def __set_name__(self, owner, name):
-        """Add the metadata for this field to the parent data model."""
-        super().__set_name__(owner, name)
+    __slots__ = ()
 
-        # Create the model metadata if it doesn't exist
-        if not owner._fields:
-            owner._fields = []
-
-        # Add this field to the model metadata
-        owner._fields.append((
-            name, 
-            FIELD_TYPE_BLOB | self.flags, 
-            self.length if self.length else 256, 
-            self.default
-        ))
+    field_type     = FIELD_TYPE_BLOB
+    default_length = 256
 
 
 class DateTimeField(Field):
     """A datetime field."""
-    def __set_name__(self, owner, name):
-        """Add the metadata for this field to the parent data model."""
-        super().__set_name__(owner, name)
+    __slots__ = ()
 
-        # Create the model metadata if it doesn't exist
-        if not owner._fields:
-            owner._fields = []
+    field_type = FIELD_TYPE_DATETIME
+
+    def __init__(self, **kwargs):
+        """Setup this field."""
+        super().__init__(**kwargs)
 
-        # Add this field to the model metadata
-        owner._fields.append((
-            name, 
-            FIELD_TYPE_DATETIME | self.flags, 
-            None,        # length doesn't apply to this data type 
-            self.default
-        ))
+        # Store a NOW default the same way as "now()" so it can be used in table definitions
+        if self.default is NOW:
+            self.default = "now()"
 
     def __set__(self, obj, value):
         """Set the value of this field."""
         # Handle special values
-        if isinstance(value, str) and value.lower() == "now()":
+        if value is NOW:
             value = datetime.now()
 
-        super().__set__(obj, value)
+        # Only 5 character strings can spell "now()", so other strings are stored without being lowercased
+        elif isinstance(value, str) and len(value) == 5 and value.lower() == "now()":
+            value = datetime.now()
+
+        obj._data[self.index] = value
+        obj._dirty |= 1 << self.index
 
 
 class Password(object):
     """Container for a password."""
+    __slots__ = ("value",)
+
     def __init__(self, value):
         """Setup this password."""
         self.value = value
 
     def __eq__(self, value):
         """Compare the given password with the password hash."""
-        return pbkdf2_sha256.verify(value, self.value)
+        # Let passlib handle anything that isn't a well-formed PBKDF2-SHA256 hash
+        params = _parse_pbkdf2_sha256(self.value)
+
+        if params is None:
+            return pbkdf2_sha256.verify(value, self.value)
+
+        # Derive the key with hashlib's C implementation and compare it in constant time
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+
+        rounds, salt, checksum = params
+        key = hashlib.pbkdf2_hmac("sha256", value, salt, rounds, len(checksum))
+        return hmac.compare_digest(key, checksum)
 
 
 class PasswordField(Field):
     """A password field."""
-    def __set_name__(self, owner, name):
-        """Add the metadata for this field to the parent data model."""
-        super().__set_name__(owner, name)
+    __slots__ = ("hasher",)
 
-        # Create the model metadata if it doesn't exist
-        if not owner._fields:
-            owner._fields = []
+    field_type     = FIELD_TYPE_PSWD
+    default_length = 256
 
-        # Add this field to the model metadata
-        owner._fields.append((
-            name, 
-            FIELD_TYPE_PSWD | self.flags, 
-            self.length if self.length else 256, 
-            self.default
-        ))
+    def __init__(self, **kwargs):
+        """Setup this field."""
+        super().__init__(**kwargs)
+
+        # Configure the password hasher once rather than on every hash
+        rounds = kwargs.get("rounds")
+        self.hasher = pbkdf2_sha256.using(rounds=rounds) if rounds else pbkdf2_sha256
 
     def __get__(self, obj, objtype=None):
         """Return the password."""
-        return Password(super().__get__(obj, objtype))
+        if obj is None:
+            return self
 
-    def __set__(self, obj, value):
-        """Hash the given password before storing it."""
+        return Password(obj._data[self.index])
+
+    def hash(self, value):
+        """Hash the given password and return it as a password object.
+
+        This method is safe to call from other threads.
+        """
         # Handle None
         if value is None:
             value = ""
 
-        # Handle already hashed passwords
-        if isinstance(value, bytes) and value.startswith(b"$pbkdf2-sha256"):
-            super().__set__(obj, value)
-            return
+        return Password(self.hasher.hash(value))
+
+    def hash_many(self, values, max_workers=None):
+        """Hash the given passwords in parallel.
+
+        The password objects are returned in the same order as the given passwords.
+        """
+        with ThreadPoolExecutor(max_workers) as pool:
+            return list(pool.map(self.hash, values))
+
+    def __set__(self, obj, value):
+        """Hash the given password before storing it."""
+        # Store password objects holding a well-formed hash (from another data model or the "hash" method) and 
+        # well-formed hashes read from the database as-is, and hash anything else
+        if isinstance(value, Password):
+            value = value.value
+
+            if _parse_pbkdf2_sha256(value) is None:
+                value = self.hash(value).value
+
+        elif not (isinstance(value, bytes) and _parse_pbkdf2_sha256(value) is not None):
+            value = self.hash(value).value
 
-        super().__set__(obj, pbkdf2_sha256.hash(value))
+        obj._data[self.index] = value
+        obj._dirty |= 1 << self.index
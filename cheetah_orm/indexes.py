@@ -14,42 +14,28 @@ from .constants import *
 # =======
 class Index(object):
     """An normal index."""
+    index_type = INDEX_TYPE_KEY
+
     def __init__(self, *args):
         """Setup this index."""
         self.fields = args
 
     def __set_name__(self, owner, name):
-        """Add this index to the data model."""
-        # Create the model metadata if it doesn't exist
-        if not owner._indexes:
-            owner._indexes = []
+        """Store the index name for later use."""
+        self.name = name
 
-        # Add this index to the model metadata
-        owner._indexes.append((
-            name,
-            INDEX_TYPE_KEY,
+    def _metadata(self):
+        """Return the metadata the parent data model stores for this index."""
+        return (
+            self.name,
+            self.index_type,
             self.fields
-        ))
+        )
 
 
-class UniqueIndex(object):
+class UniqueIndex(Index):
     """A unique index."""
-    def __init__(self, *args):
-        """Setup this index."""
-        self.fields = args
-
-    def __set_name__(self, owner, name):
-        """Add this index to the data model."""
-        # Create the model metadata if it doesn't exist
-        if not owner._indexes:
-            owner._indexes = []
-
-        # Add this index to the model metadata
-        owner._indexes.append((
-            name,
-            INDEX_TYPE_UNIQUE_KEY,
-            self.fields
-        ))
+    index_type = INDEX_TYPE_UNIQUE_KEY
 
 
 class ForeignKey(object):
@@ -62,14 +48,13 @@ class ForeignKey(object):
         self.on_update = on_update
 
     def __set_name__(self, owner, name):
-        """Add this index to the data model."""
-        # Create the model metadata if it doesn't exist
-        if not owner._indexes:
-            owner._indexes = []
+        """Store the index name for later use."""
+        self.name = name
 
-        # Add this index to the model metadata
-        owner._indexes.append((
-            name,
+    def _metadata(self):
+        """Return the metadata the parent data model stores for this index."""
+        return (
+            self.name,
             INDEX_TYPE_FOREIGN_KEY,
             (
                 self.model.table,
@@ -79,4 +64,4 @@ class ForeignKey(object):
                 self.on_delete,
                 self.on_update
             )
-        ))
+        )
@@ -1,13 +1,424 @@
 """Cheetah ORM - Mapper Classes"""
 
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+from itertools import chain
+import os
+from queue import Empty, LifoQueue
+from uuid import uuid4
+
 from .constants import *
-from .error import InvalidParamsError, InvalidTypeError
+from .error import InvalidParamsError, InvalidTypeError, MissingDriverError
+
+
+# Constants
+# =========
+_SQLITE_COL_TYPES = {
+    FIELD_TYPE_INT:      "INT",
+    FIELD_TYPE_BIGINT:   "BIGINT",
+    FIELD_TYPE_FLOAT:    "FLOAT",
+    FIELD_TYPE_DOUBLE:   "FLOAT",
+    FIELD_TYPE_STRING:   "VARCHAR",
+    FIELD_TYPE_BLOB:     "BLOB",
+    FIELD_TYPE_DATETIME: "DATETIME",
+    FIELD_TYPE_PSWD:     "BLOB"
+}
+
+_MYSQL_COL_TYPES = {
+    FIELD_TYPE_INT:      "INT",
+    FIELD_TYPE_BIGINT:   "BIGINT",
+    FIELD_TYPE_FLOAT:    "FLOAT",
+    FIELD_TYPE_DOUBLE:   "FLOAT",
+    FIELD_TYPE_STRING:   "TEXT",
+    FIELD_TYPE_BLOB:     "BLOB",
+    FIELD_TYPE_DATETIME: "DATETIME",
+    FIELD_TYPE_PSWD:     "BLOB"
+}
+
+_POSTGRESQL_COL_TYPES = {
+    FIELD_TYPE_INT:      "INT",
+    FIELD_TYPE_BIGINT:   "BIGINT",
+    FIELD_TYPE_FLOAT:    "FLOAT",
+    FIELD_TYPE_DOUBLE:   "FLOAT",
+    FIELD_TYPE_STRING:   "VARCHAR",
+    FIELD_TYPE_BLOB:     "BYTEA",
+    FIELD_TYPE_DATETIME: "TIMESTAMP",
+    FIELD_TYPE_PSWD:     "BYTEA"
+}
+
+_SQLITE_MAX_PARAMS     = 999     # parameters per statement
+_SQLITE_STMT_CACHE     = 512     # prepared statements cached per connection
+_MYSQL_MAX_INSERT_ROWS = 1000    # rows per multi-row insert statement
+_MYSQL_MAX_PARAMS      = 65535   # parameters per statement
+
+_FK_ACTIONS = {
+    FK_SET_NULL:    "SET NULL",
+    FK_SET_DEFAULT: "SET DEFAULT",
+    FK_CASCADE:     "CASCADE",
+    FK_RESTRICT:    "RESTRICT",
+    FK_NO_ACTION:   "NO ACTION"
+}
+
+
+# Functions
+# =========
+@lru_cache(maxsize=256)
+def _check_fields(model, fields):
+    """Ensure that the given field names are fields of a data model or "id". Since the names are inserted into 
+    SQL as identifiers, anything else is rejected.
+    """
+    for field in fields:
+        if field != "id" and field not in model._field_names:
+            raise InvalidParamsError(f'"{field}" is not a field of data model "{model.__name__}".')
+
+
+def _close_pool(pool, close=None):
+    """Close all connections in the given connection pool. If a function is given, it is called to close each 
+    connection instead of its "close" method.
+    """
+    while True:
+        try:
+            db = pool.get_nowait()
+
+        except Empty:
+            break
+
+        if close is None:
+            db.close()
+
+        else:
+            close(db)
+
+
+def _close_sqlite(db):
+    """Let SQLite refresh the query planner statistics of a connection and close it. The statistics are skipped 
+    if another connection holds the write lock that the analysis needs.
+    """
+    try:
+        db.execute("PRAGMA analysis_limit=400;")
+        db.execute("PRAGMA optimize;")
+
+    except _import_driver("sqlite3").OperationalError:
+        pass
+
+    db.close()
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _column_def_sql(dialect, type, length, default):
+    """Build the SQL that follows the name in a column definition.
+
+    The SQL is cached so that fields with the same type, length, and default skip rebuilding it. Caching is typed 
+    so that defaults like 1 and 1.0 are kept apart.
+    """
+    parts = [_column_type_sql(dialect, type, length)]
+
+    # Not null?
+    if type & FIELD_TYPE_NOT_NULL:
+        parts.append(" NOT NULL")
+
+    # Add default value
+    if default is not None:
+        parts.append(f" DEFAULT {_default_sql(dialect, default)}")
+
+    return "".join(parts)
+
+
+def _column_sql(dialect, name, type, length, default):
+    """Build the SQL for a column definition."""
+    q = dialect.quote
+    return f"{q}{name}{q} {_column_def_sql(dialect, type, length, default)}"
+
+
+@lru_cache(maxsize=1024)
+def _column_type_sql(dialect, type, length):
+    """Build the SQL for the type of a column."""
+    # Unsigned?
+    parts = ["UNSIGNED "] if type & FIELD_TYPE_UNSIGNED else []
+
+    # Add column type
+    base_type = type & FIELD_TYPE_MASK
+    col_type = dialect.col_types.get(base_type)
+
+    if col_type is None:
+        raise InvalidTypeError(f"Field type {type} is not a valid type.")
+
+    parts.append(col_type)
+
+    # Add length
+    if length and base_type not in dialect.length_skip:
+        parts.append(f"({length})")
+
+    return "".join(parts)
+
+
+@lru_cache(maxsize=256)
+def _compose_filter_sql(select, condition, order_by, order, limit, offset, quote):
+    """Build the SQL for a filter or count query. Column names in "order_by" are quoted with the given quote 
+    character.
+
+    The SQL is cached so that repeated queries with the same shape skip rebuilding it.
+    """
+    parts = [select]
+
+    # Is there a condition?
+    if condition != "":
+        parts.append(f" WHERE {condition}")
+
+    # Are there columns to order by?
+    if order_by is not None:
+        cols = ",".join(f"{quote}{col}{quote}" for col in order_by)
+        parts.append(f" ORDER BY {cols} {order}")
+
+    # Is there a limit?
+    if limit is not None:
+        parts.append(f" LIMIT {limit}")
+
+        # Is there an offset?
+        if offset is not None:
+            parts.append(f" OFFSET {offset}")
+
+    parts.append(";")
+    return "".join(parts)
+
+
+def _default_sql(dialect, default):
+    """Build the SQL for the default value of a column. Strings are escaped and quoted unless the dialect 
+    replaces them with special SQL (like "now()").
+    """
+    # Is the default a string?
+    if isinstance(default, str):
+        # Is it a special value?
+        special = dialect.defaults.get(default)
+
+        if special is not None:
+            return special
+
+        # Escape and quote the string
+        if dialect.backslash_escapes:
+            default = default.replace("\\", "\\\\")
+
+        return "'" + default.replace("'", "''") + "'"
+
+    # Booleans are stored as integers
+    if isinstance(default, bool):
+        return str(int(default))
+
+    return str(default)
+
+
+@lru_cache(maxsize=256)
+def _delete_in_sql(delete, count):
+    """Expand a single-row delete statement into a statement that deletes the given number of rows by ID."""
+    head, _, placeholder = delete[:-1].rpartition("=")
+    return f"{head} IN ({','.join([placeholder] * count)});"
+
+
+def _filter_options(model, kwargs):
+    """Get the columns to order by, the sort order, the limit, and the offset of a filter query from its keyword 
+    arguments. Since they are inserted into the SQL, only the fields of the data model and "id" may be used to order 
+    the results, the sort order must be "ASC" or "DESC", and the limit and offset must be integers.
+    """
+    order_by = kwargs.get("order_by")
+
+    if order_by is not None:
+        order_by = tuple(order_by)
+        _check_fields(model, order_by)
+
+    order = kwargs.get("order", "ASC")
+
+    if not isinstance(order, str) or order.upper() not in ("ASC", "DESC"):
+        raise InvalidParamsError(f'"{order}" is not a valid sort order.')
+
+    limit  = kwargs.get("limit")
+    offset = kwargs.get("offset")
+
+    try:
+        limit  = int(limit) if limit is not None else None
+        offset = int(offset) if offset is not None else None
+
+    except (TypeError, ValueError):
+        raise InvalidParamsError("The limit and offset of a filter query must be integers.") from None
+
+    return order_by, order.upper(), limit, offset
+
+
+def _fk_action(mode):
+    """Return the SQL for the given foreign key mode."""
+    try:
+        return _FK_ACTIONS[mode]
+
+    except KeyError:
+        raise InvalidParamsError(f"Foreign key mode {mode} is not a valid mode.")
+
+
+def _group_by_class(models):
+    """Group the given data models by their class."""
+    groups = {}
+
+    for model in models:
+        groups.setdefault(model.__class__, []).append(model)
+
+    return groups
+
+
+@lru_cache(maxsize=None)
+def _import_driver(name):
+    """Import a database driver the first time a mapper needs it, so that importing this module doesn't import 
+    every driver. Raises MissingDriverError if the driver isn't installed.
+    """
+    try:
+        return import_module(name)
+
+    except ImportError:
+        raise MissingDriverError(f'The "{name.partition(".")[0]}" driver is required to use this mapper.') from None
+
+
+def _iter_models(model, cur, sql, args, chunksize):
+    """Execute a query on the given cursor and build data models from its rows, fetching the given number of rows 
+    at a time.
+
+    The query only runs once iteration starts, and the cursor is closed when the results have been consumed or 
+    the iterator is closed, so a query is never left running on the connection by an iterator that is abandoned 
+    early.
+    """
+    try:
+        cur.execute(sql, args)
+
+        while True:
+            rows = cur.fetchmany(chunksize)
+
+            if not rows:
+                break
+
+            yield from _load_models(model, rows)
+
+    finally:
+        cur.close()
+
+
+def _load_models(model, rows):
+    """Build data models from the given rows without going through their initializer.
+
+    Each row must contain the ID of a data model followed by its field values in metadata order.
+    """
+    results = []
+    new = model.__new__
+    append = results.append
+
+    for row in rows:
+        result = new(model)
+        result._id, *result._data = row
+        result._dirty = 0
+        append(result)
+
+    return results
+
+
+@lru_cache(maxsize=256)
+def _mysql_insert_sql(insert, count):
+    """Expand a single-row MySQL/MariaDB insert statement into a statement that inserts the given number of
+    rows.
+    """
+    head, _, row = insert[:-1].rpartition(" VALUES ")
+    return f"{head} VALUES {','.join([row] * count)};"
+
+
+@lru_cache(maxsize=1024)
+def _qmark_to_pg(condition):
+    """Translate a condition format string with "?" placeholders and backtick quoting to PostgreSQL syntax."""
+    return condition.replace("?", "%s").replace("`", '"')
+
+
+@lru_cache(maxsize=1024)
+def _qmark_to_pyformat(condition):
+    """Translate a condition format string with "?" placeholders to "%s" placeholders."""
+    return condition.replace("?", "%s")
+
+
+@lru_cache(maxsize=256)
+def _select_sql(dialect, model, fields):
+    """Build the SQL that selects the given fields of a data model. Only the fields of the data model and "id" 
+    may be selected.
+    """
+    _check_fields(model, fields)
+    q = dialect.quote
+    cols = ",".join(f"{q}{field}{q}" for field in fields)
+    return f"SELECT {cols} FROM {q}{model.table}{q}"
+
+
+def _sqlite_pool_key(database):
+    """Get the pool key of an SQLite database from its real path and the device and inode numbers of its file. 
+    Returns None for in-memory databases and missing files.
+
+    A pooled connection keeps its file open, so the inode of a deleted file can't be reused while the connection 
+    is in the pool.
+    """
+    if database in ("", ":memory:"):
+        return None
+
+    try:
+        stat = os.stat(database)
+
+    except OSError:
+        return None
+
+    return (database, stat.st_dev, stat.st_ino)
 
 
 # Classes
 # =======
+@dataclass(frozen=True, eq=False)
+class _Dialect(object):
+    """The parts of the table SQL that differ between database systems. Dialects are compared and hashed by 
+    identity so they can be used as cache keys.
+    """
+    quote:             str          # identifier quote character
+    id_col:            str          # type of the ID column
+    col_types:         dict         # column type of each field type
+    length_skip:       frozenset    # field types that do not take a length
+    defaults:          dict         # replacements for special default values
+    backslash_escapes: bool         # whether backslashes escape characters in string literals
+
+
+_SQLITE_DIALECT = _Dialect(
+    quote="`",
+    id_col="INTEGER PRIMARY KEY",
+    col_types=_SQLITE_COL_TYPES,
+    length_skip=frozenset(),
+    defaults={"now()": "'now()'"},
+    backslash_escapes=False
+)
+
+_MYSQL_DIALECT = _Dialect(
+    quote="`",
+    id_col="BIGINT PRIMARY KEY AUTO_INCREMENT",
+    col_types=_MYSQL_COL_TYPES,
+    length_skip=frozenset(),
+    defaults={"now()": "now()"},
+    backslash_escapes=True
+)
+
+_POSTGRESQL_DIALECT = _Dialect(
+    quote='"',
+    id_col="BIGSERIAL PRIMARY KEY",
+    col_types=_POSTGRESQL_COL_TYPES,
+    length_skip=frozenset((FIELD_TYPE_INT, FIELD_TYPE_BIGINT, FIELD_TYPE_BLOB, FIELD_TYPE_PSWD)),
+    defaults={"now()": "now()"},
+    backslash_escapes=False
+)
+
+
 class Mapper(object):
-    """Base class for a data model mapper."""
+    """Base class for a data model mapper.
+    
+    Derived classes that pool their connections set "_pool" to their own dictionary of connection queues.
+    """
+    _dialect = None
+    _pool    = {}
+
     def __init__(self):
         """Setup this mapper."""
         self._db = None
@@ -35,6 +446,19 @@ class Mapper(object):
         """
         pass
 
+    @classmethod
+    def shutdown_pool(cls):
+        """Close all pooled connections."""
+        for pool in cls._pool.values():
+            _close_pool(pool)
+
+    def begin(self):
+        """Begin a transaction.
+        
+        This should be overridden by a derived class.
+        """
+        pass
+
     def commit(self):
         """Commit changes to a database.
         
@@ -49,15 +473,98 @@ class Mapper(object):
         """
         pass
 
-    def init_model(self, model):
-        """Initialize the table for a data model.
+    @contextmanager
+    def transaction(self):
+        """Run a block of operations in a single transaction. The transaction is committed when the block 
+        exits normally and rolled back if it raises an exception. Bulk imports should wrap their "save_model" 
+        calls in "with mapper.transaction():" so that the changes are synced to disk once instead of once per 
+        statement.
+        """
+        self.begin()
+
+        try:
+            yield self
+
+        except BaseException:
+            self.rollback()
+            raise
+
+        self.commit()
+
+    def _table_ddl(self, model):
+        """Build the SQL statements that create the table and normal indexes for a data model."""
+        dialect = self._dialect
+        q = dialect.quote
+
+        # Build field SQL
+        field_sql = [f"{q}id{q} {dialect.id_col}"]
+        field_sql.extend(_column_sql(dialect, *field) for field in model._fields)
+
+        # Build index SQL
+        index_sql = []
+        indexes = []
+
+        for index in model._indexes or ():
+            # Generate index name
+            idx = f"CONSTRAINT {q}{model.table}_{index[0]}{q} "
+
+            # Add index type
+            if index[1] & INDEX_TYPE_KEY:
+                # Normal indexes must be created with "CREATE INDEX"
+                indexes.append(index)
+                continue
+
+            elif index[1] & INDEX_TYPE_UNIQUE_KEY:
+                fields = ",".join(f"{q}{field}{q}" for field in index[2])
+                idx += f"UNIQUE({fields})"
+
+            elif index[1] & INDEX_TYPE_FOREIGN_KEY:
+                idx += f"FOREIGN KEY({q}{index[0][:-4]}{q}) REFERENCES {q}{index[2][0]}{q}({q}{index[2][1]}{q})"
+                idx += f" ON DELETE {_fk_action(index[3][0])} ON UPDATE {_fk_action(index[3][1])}"
+
+            else:
+                raise InvalidTypeError(f"Index type {index[1]} is not a valid type.")
+
+            index_sql.append(idx)
+
+        # Build table SQL
+        ddl = [f"CREATE TABLE IF NOT EXISTS {q}{model.table}{q}({','.join(field_sql + index_sql)});"]
+
+        # Build normal index SQL
+        for index in indexes:
+            fields = ",".join(f"{q}{field}{q}" for field in index[2])
+            ddl.append(
+                f"CREATE INDEX IF NOT EXISTS {q}{model.table}_{index[0]}{q} ON {q}{model.table}{q}({fields});"
+            )
+
+        return ddl
+
+    def _execute_ddl(self, ddl):
+        """Execute the SQL statements that create the table for a data model."""
+        for sql in ddl:
+            self._cur.execute(sql)
+
+    def init_model(self, model, force=False):
+        """Initialize the table for a data model. Data models that were already initialized by this mapper are 
+        skipped unless "force" is true.
+        """
+        # Was this data model already initialized?
+        if model in self._cache and not force:
+            return
+
+        # Create the table and generate SQL statements for the given model
+        self._execute_ddl(self._table_ddl(model))
+        self._gen_sql_stmts(model)
+
+    def save_model(self, model):
+        """Save a data model to the database.
         
         This should be overridden by a derived class.
         """
         pass
 
-    def save_model(self, model):
-        """Save a data model to the database.
+    def save_models(self, models):
+        """Save several data models to the database.
         
         This should be overridden by a derived class.
         """
@@ -70,6 +577,20 @@ class Mapper(object):
         """
         pass
 
+    def delete_models(self, models):
+        """Delete several data models in the database.
+        
+        This should be overridden by a derived class.
+        """
+        pass
+
+    def delete_filter(self, model, condition, *args):
+        """Delete the data in a database that matches a condition.
+        
+        This should be overridden by a derived class.
+        """
+        pass
+
     def filter(self, model, condition="", *args, **kwargs):
         """Filter data in a database.
         
@@ -77,316 +598,414 @@ class Mapper(object):
         """
         pass
 
+    def iter_filter(self, model, condition="", *args, chunksize=1000, **kwargs):
+        """Filter data in a database and yield the results one at a time instead of building a list. Rows are 
+        fetched from the database in chunks of the given size. To stop before all of the results have been 
+        consumed, call "close" on the returned iterator.
+        
+        This should be overridden by a derived class.
+        """
+        pass
+
+    def filter_values(self, model, fields, condition="", *args, **kwargs):
+        """Filter data in a database and return only the values of the given fields as a list of tuples.
+        
+        This should be overridden by a derived class.
+        """
+        pass
+
+    def exists(self, model, condition="", *args):
+        """Check whether any data in a database matches a condition.
+        
+        This should be overridden by a derived class.
+        """
+        pass
+
 
 class SQLiteMapper(Mapper):
-    """A data model mapper for SQLite databases."""
+    """A data model mapper for SQLite databases.
+    
+    Connections to database files are pooled. Disconnecting returns the connection to a pool that is shared by 
+    all SQLite mappers, and connecting to the same database again reuses it. Connections are pooled by the real 
+    path and identity of the database file, so they are never reused after the file was deleted or replaced. 
+    Call "shutdown_pool" to close all pooled connections.
+    """
+    _dialect = _SQLITE_DIALECT
+    _pool    = {}
+
     def _gen_sql_stmts(self, model):
         """Generate SQL statements for the given model."""
         cache_entry = {}
 
+        # Quote column names
+        quoted = [f"`{col[0]}`" for col in model._fields]
+        cols = ",".join(quoted)
+
         # Generate insert statement
-        cols = ",".join([f"`{col[0]}`" for col in model._fields])
-        placeholders = ",".join(["?" for col in model._fields])
+        placeholders = ",".join("?" * len(quoted))
         cache_entry["insert"] = f"INSERT INTO `{model.table}`({cols}) VALUES ({placeholders});"
 
         # Generate update statement
-        cols = ",".join([f"`{col[0]}`=?" for col in model._fields])
-        cache_entry["update"] = f"UPDATE `{model.table}` SET {cols} WHERE `id`=?;"
+        assignments = ",".join(f"{col}=?" for col in quoted)
+        cache_entry["update"] = f"UPDATE `{model.table}` SET {assignments} WHERE `id`=?;"
 
         # Generate delete statement
         cache_entry["delete"] = f"DELETE FROM `{model.table}` WHERE `id`=?;"
+        cache_entry["delete_filter"] = f"DELETE FROM `{model.table}`"
 
         # Generate select statement
-        cols = ",".join([f"`{col[0]}`" for col in model._fields])
         cache_entry["select"] = f"SELECT `id`,{cols} FROM `{model.table}`"
 
         # Generate count statement
         cache_entry["count"] = f"SELECT COUNT(`id`) FROM `{model.table}`"
 
+        # Generate exists statement
+        cache_entry["exists"] = f"SELECT 1 FROM `{model.table}`"
+
         # Add cache entry
         self._cache[model] = cache_entry
 
-    def connect(self, database):
-        """Connect to an SQLite database."""
-        # Connect to the database and get a cursor object
-        import sqlite3
-
-        self._db  = sqlite3.connect(database)
-        self._db.row_factory = sqlite3.Row
-        self._cur = self._db.cursor()
-
-        # Enable foreign key checks
-        self._cur.execute("PRAGMA foreign_keys=ON;")
-
-    def disconnect(self):
-        """Disconnect from an SQLite database."""
-        self._cur.close()
-        self._db.close()
-        self._cur = None
-        self._db  = None
-
-    def commit(self):
-        """Commit changes to the database."""
-        self._db.commit()
-
-    def rollback(self):
-        """Rollback changes to the database."""
-        self._db.rollback()
-
-    def init_model(self, model):
-        """Initialize the table for a data model."""
-        # Build field SQL
-        field_sql = "`id` INTEGER PRIMARY KEY,"
-
-        for name, type, length, default in model._fields:
-            # Generate column name
-            col = f"`{name}` "
+    def connect(self, database, wal=False):
+        """Connect to an SQLite database.
+        
+        If "wal" is true, the database is switched to write-ahead logging with "synchronous=NORMAL", so commits 
+        no longer sync a rollback journal and readers don't block the writer. The journal mode is stored in the 
+        database file, so it stays in effect for later connections. The synchronous setting only applies to this 
+        connection and is restored before the connection is pooled.
+        """
+        # Forget data models initialized for a previous connection
+        self._cache = {}
 
-            # Unsigned?
-            if type & FIELD_TYPE_UNSIGNED:
-                col += "UNSIGNED "
+        # Connect to the database and get a cursor object
+        sqlite3 = _import_driver("sqlite3")
 
-            # Add column type
-            if type & FIELD_TYPE_INT:
-                col += "INT"
+        self._database = database if database in ("", ":memory:") else os.path.realpath(database)
 
-            elif type & FIELD_TYPE_BIGINT:
-                col += "BIGINT"
+        self._pool_key = _sqlite_pool_key(self._database)
 
-            elif type & FIELD_TYPE_FLOAT:
-                col += "FLOAT"
+        try:
+            self._db  = self._pool[self._pool_key].get_nowait()
+            self._cur = self._db.cursor()
 
-            elif type & FIELD_TYPE_DOUBLE:
-                col += "FLOAT"
+        except (KeyError, Empty):
+            # Pooled connections may be reused by another thread. The sqlite3 module keeps the statements it 
+            # prepared in a cache keyed by their SQL, and the statements of each data model are generated once, so 
+            # the cache is sized to keep them prepared for several data models.
+            self._db = sqlite3.connect(
+                self._database,
+                check_same_thread=False,
+                cached_statements=_SQLITE_STMT_CACHE
+            )
+            self._cur = self._db.cursor()
 
-            elif type & FIELD_TYPE_STRING:
-                col += "VARCHAR"
+            # Enable foreign key checks
+            self._cur.execute("PRAGMA foreign_keys=ON;")
 
-            elif type & FIELD_TYPE_BLOB:
-                col += "BLOB"
+            # Remember which file the connection was opened on (it exists now even if it was just created) and 
+            # close the pooled connections to any file that was previously at the same path
+            self._pool_key = _sqlite_pool_key(self._database)
 
-            elif type & FIELD_TYPE_DATETIME:
-                col += "DATETIME"
+            for key in [key for key in self._pool if key[0] == self._database and key != self._pool_key]:
+                _close_pool(self._pool.pop(key))
 
-            elif type & FIELD_TYPE_PSWD:
-                col += "BLOB"
+        # Enable write-ahead logging? (in-memory databases don't support it)
+        self._synchronous = None
 
-            else:
-                raise InvalidTypeError(f"Field type {type} is not a valid type.")
+        if wal and database not in ("", ":memory:"):
+            self._synchronous = self._cur.execute("PRAGMA synchronous;").fetchone()[0]
+            self._cur.execute("PRAGMA journal_mode=WAL;")
+            self._cur.execute("PRAGMA synchronous=NORMAL;")
 
-            # Add length
-            if length:
-                col += f"({length})"
+    def disconnect(self):
+        """Disconnect from an SQLite database."""
+        self._cur.close()
 
-            # Not null?
-            if type & FIELD_TYPE_NOT_NULL:
-                col += f" NOT NULL"
+        # In-memory databases only live as long as their connection, so they are never pooled. Neither are 
+        # connections to a file that was deleted or replaced while connected.
+        if self._pool_key is None or _sqlite_pool_key(self._database) != self._pool_key:
+            self._db.close()
 
-            # Add default value
-            if default is not None:
-                # Handle now()
-                if default == "now()":
-                    default = "'now()'"
+        else:
+            # Discard uncommitted changes and return the connection to the pool
+            self._db.rollback()
 
-                col += f" DEFAULT {default}"
+            # Restore the synchronous setting changed by "connect" so it doesn't carry over to the next user
+            if self._synchronous is not None:
+                self._db.execute(f"PRAGMA synchronous={self._synchronous};")
 
-            field_sql += f"{col},"
+            self._pool.setdefault(self._pool_key, LifoQueue()).put(self._db)
 
-        if field_sql[-1] == ",":
-            field_sql = field_sql[:-1]
+        self._cur = None
+        self._db  = None
 
-        # Build index SQL
-        index_sql = ""
-        indexes = []
+    @classmethod
+    def shutdown_pool(cls):
+        """Close all pooled connections.
 
-        for index in model._indexes:
-            # Generate index name
-            idx = f"CONSTRAINT `{model.table}_{index[0]}` "
+        Before each connection is closed, SQLite refreshes the query planner statistics that the queries run on it 
+        would benefit from. The analysis is limited so that it stays cheap.
+        """
+        for pool in cls._pool.values():
+            _close_pool(pool, _close_sqlite)
 
-            # Add index type
-            if index[1] & INDEX_TYPE_KEY:
-                # Normal indexes must be created with "CREATE INDEX" in SQLite
-                indexes.append(index)
-                continue
+    def begin(self):
+        """Begin a transaction.
+        
+        The transaction takes the write lock immediately, so a transaction that starts by reading can't fail to 
+        upgrade its lock later because another connection started writing first.
+        """
+        if not self._db.in_transaction:
+            self._cur.execute("BEGIN IMMEDIATE;")
 
-            elif index[1] & INDEX_TYPE_UNIQUE_KEY:
-                fields = ",".join([f"`{field}`" for field in index[2]])
-                idx += f"UNIQUE({fields})"
+    def commit(self):
+        """Commit changes to the database."""
+        self._db.commit()
 
-            elif index[1] & INDEX_TYPE_FOREIGN_KEY:
-                idx += f"FOREIGN KEY(`{index[0][:-4]}`) REFERENCES `{index[2][0]}`(`{index[2][1]}`)"
+    def rollback(self):
+        """Rollback changes to the database."""
+        self._db.rollback()
 
-                # On delete clause
-                idx += " ON DELETE "
+    def _execute_ddl(self, ddl):
+        """Execute the SQL statements that create the table for a data model.
+        
+        The statements are executed as a single transaction. "executescript" commits any pending transaction 
+        first, so the statements are executed one by one if a transaction is already open.
+        """
+        if self._db.in_transaction:
+            for sql in ddl:
+                self._cur.execute(sql)
 
-                if index[3][0] & FK_SET_NULL:
-                    idx += "SET NULL"
+        else:
+            self._cur.executescript("\n".join(["BEGIN;", *ddl, "COMMIT;"]))
 
-                elif index[3][0] & FK_SET_DEFAULT:
-                    idx += "SET DEFAULT"
+    def save_model(self, model):
+        """Save the given model to the database.
+        
+        This method will choose to do an insert if the model has not been previously saved. Otherwise it 
+        will perform and update to the existing row in the corresponding database table. Previously saved
+        models without any changed fields are skipped.
+        """
+        cache = self._cache[model.__class__]
 
-                elif index[3][0] & FK_CASCADE:
-                    idx += "CASCADE"
+        # Has the model been saved previously?
+        if model._id is not None:
+            # Skip the update if no fields have changed since the last save
+            if not model._dirty:
+                return
 
-                elif index[3][0] & FK_RESTRICT:
-                    idx += "RESTRICT"
+            # Update existing row in the database
+            self._cur.execute(cache["update"], model._data + [model._id])
 
-                elif index[3][0] & FK_NO_ACTION:
-                    idx += "NO ACTION"
+        else:
+            # Insert the data model into the table and fetch its ID
+            self._cur.execute(cache["insert"], model._data)
+            model._id = self._cur.lastrowid
 
-                # On update clause
-                idx += " ON UPDATE "
+        model._dirty = 0
 
-                if index[3][1] & FK_SET_NULL:
-                    idx += "SET NULL"
+    def save_models(self, models):
+        """Save the given models to the database.
 
-                elif index[3][1] & FK_SET_DEFAULT:
-                    idx += "SET DEFAULT"
+        This method works like "save_model", but it inserts and updates the given models in bulk with a 
+        single statement execution per data model class. All of the writes share the transaction that the
+        sqlite3 module opens implicitly, so they are only synced to disk once when "commit" is called.
 
-                elif index[3][1] & FK_CASCADE:
-                    idx += "CASCADE"
+        The IDs of inserted data models are derived from the last inserted rowid. This assumes that SQLite 
+        allocates consecutive rowids to the inserted rows, which holds for the "INTEGER PRIMARY KEY" ID column 
+        created by "init_model" as long as no trigger inserts rows into the same table and the largest rowid 
+        hasn't been reached.
+        """
+        for cls, group in _group_by_class(models).items():
+            cache = self._cache[cls]
 
-                elif index[3][1] & FK_RESTRICT:
-                    idx += "RESTRICT"
+            # Update existing rows in the database
+            updates = [model for model in group if model._id is not None and model._dirty]
 
-                elif index[3][1] & FK_NO_ACTION:
-                    idx += "NO ACTION"
+            if updates:
+                values = [model._data + [model._id] for model in updates]
+                self._cur.executemany(cache["update"], values)
 
-            else:
-                raise InvalidTypeError(f"Index type {index[1]} is not a valid type.")
+            # Insert new data models into the table and assign their IDs (SQLite allocates the rowids of
+            # consecutive inserts sequentially)
+            inserts = [model for model in group if model._id is None]
 
-            index_sql += f"{idx},"
+            if inserts:
+                self._cur.executemany(cache["insert"], [model._data for model in inserts])
+                assert self._cur.rowcount == len(inserts), "every data model should have inserted one row"
+                self._cur.execute("SELECT last_insert_rowid();")
+                last_id = self._cur.fetchone()[0]
 
-        if index_sql[-1] == ",":
-            index_sql = index_sql[:-1]
+                for id, model in enumerate(inserts, last_id - len(inserts) + 1):
+                    model._id = id
 
-        # Build table SQL
-        sql = f"CREATE TABLE IF NOT EXISTS `{model.table}`({field_sql},{index_sql});"
+            for model in updates + inserts:
+                model._dirty = 0
 
-        # Create the table
-        # print(sql)
-        self._cur.execute(sql)
+    def delete_model(self, model):
+        """Delete the given model from the database."""
+        self._cur.execute(self._cache[model.__class__]["delete"], (model._id,))
 
-        # Create normal indexes
-        for index in indexes:
-            fields = ",".join([field for field in index[2]])
-            sql = f"CREATE INDEX IF NOT EXISTS `{model.table}_{index[0]}` ON `{model.table}`({fields});"
-            self._cur.execute(sql)
+    def delete_models(self, models):
+        """Delete the given models from the database with a single statement per data model class."""
+        for cls, group in _group_by_class(models).items():
+            delete = self._cache[cls]["delete"]
 
-        # Generate SQL statements for the given model
-        self._gen_sql_stmts(model)
+            for start in range(0, len(group), _SQLITE_MAX_PARAMS):
+                ids = [model._id for model in group[start:start + _SQLITE_MAX_PARAMS]]
+                self._cur.execute(_delete_in_sql(delete, len(ids)), ids)
 
-    def save_model(self, model):
-        """Save the given model to the database.
-        
-        This method will choose to do an insert if the model has not been previously saved. Otherwise it 
-        will perform and update to the existing row in the corresponding database table.
+    def delete_filter(self, model, condition, *args):
+        """Delete the data in the database that matches the given condition with a single statement. Returns the 
+        number of deleted rows.
         """
-        # Has the model been saved previously?
-        if "id" in model._data:
-            # Update existing row in the database
-            values = [value for key, value in model._data.items() if key != "id"]
-            values.append(model._data["id"])
-            self._cur.execute(self._cache[model.__class__]["update"], values)
-
-        else:
-            # Insert the data model into the table and fetch its ID
-            values = list(model._data.values())
-            self._cur.execute(self._cache[model.__class__]["insert"], values)
-            model._data["id"] = self._cur.lastrowid
-
-    def delete_model(self, model):
-        """Delete the given model from the database."""
-        self._cur.execute(self._cache[model.__class__]["delete"], (model.id,))
+        sql = _compose_filter_sql(
+            self._cache[model]["delete_filter"], condition, None, None, None, None, self._dialect.quote
+        )
+        self._cur.execute(sql, args)
+        return self._cur.rowcount
+
+    def _filter_sql(self, model, select, condition, **kwargs):
+        """Build the SQL for a filter query on a data model with the given select statement."""
+        order_by, order, limit, offset = _filter_options(model, kwargs)
+
+        return _compose_filter_sql(
+            select,
+            condition,
+            order_by,
+            order,
+            limit,
+            offset,
+            self._dialect.quote
+        )
 
     def filter(self, model, condition="", *args, **kwargs):
         """Filter data in the database."""
-        sql = self._cache[model]["select"]
-
-        # Is there a condition?
-        if condition != "":
-            sql += f" WHERE {condition}"
+        sql = self._filter_sql(model, self._cache[model]["select"], condition, **kwargs)
 
-        # Are there columns to order by?
-        if "order_by" in kwargs:
-            direction = kwargs.get("order", "ASC")
-            cols = ",".join([f"`{col}`" for col in kwargs["order_by"]])
-            sql += f" ORDER BY {cols} {direction}"
-
-        # Is there a limit?
-        if "limit" in kwargs:
-            sql += f" LIMIT {kwargs['limit']}"
+        # Execute query and build a data model from each row without going through its initializer
+        self._cur.execute(sql, args)
+        return _load_models(model, self._cur)
 
-            # Is there an offset?
-            if "offset" in kwargs:
-                sql += f" OFFSET {kwargs['offset']}"
+    def iter_filter(self, model, condition="", *args, chunksize=1000, **kwargs):
+        """Filter data in the database and yield the results one at a time.
+        
+        The query runs on its own cursor, so other operations may be performed while the results are consumed.
+        """
+        sql = self._filter_sql(model, self._cache[model]["select"], condition, **kwargs)
+        return _iter_models(model, self._db.cursor(), sql, args, chunksize)
 
-        sql += ";"
+    def filter_values(self, model, fields, condition="", *args, **kwargs):
+        """Filter data in the database and return only the values of the given fields. Each result is a tuple 
+        of field values in the given order.
+        """
+        sql = self._filter_sql(model, _select_sql(self._dialect, model, tuple(fields)), condition, **kwargs)
 
         # Execute query and fetch results
         self._cur.execute(sql, args)
-        results = [model(**dict(row)) for row in self._cur.fetchall()]
-        return results
+        return list(self._cur)
     
     def count(self, model, condition="", *args, **kwargs):
         """Count data in the database."""
-        sql = self._cache[model]["count"]
+        sql = _compose_filter_sql(self._cache[model]["count"], condition, None, None, None, None, self._dialect.quote)
 
-        # Is there a condition?
-        if condition != "":
-            sql += f" WHERE {condition}"
+        # Execute query and fetch results
+        self._cur.execute(sql, args)
+        return self._cur.fetchone()[0]
 
-        sql += ";"
+    def exists(self, model, condition="", *args):
+        """Check whether any data in the database matches the given condition. The query stops at the first 
+        matching row instead of counting or fetching all of them.
+        """
+        sql = _compose_filter_sql(self._cache[model]["exists"], condition, None, None, 1, None, self._dialect.quote)
 
-        # Execute query and fetch results
+        # Execute query and check for a result
         self._cur.execute(sql, args)
-        return self._cur.fetchall()[0][0]
+        return self._cur.fetchone() is not None
     
 
 class MySQLMapper(Mapper):
-    """A data model mapper for MySQL/MariaDB databases."""
+    """A data model mapper for MySQL/MariaDB databases.
+    
+    Connections are pooled. Disconnecting returns the connection to a pool that is shared by all MySQL/MariaDB 
+    mappers, and connecting with the same parameters again reuses it instead of opening a new connection. Call 
+    "shutdown_pool" to close all pooled connections.
+    """
+    _dialect = _MYSQL_DIALECT
+    _pool    = {}
+    _id_step = None
+
     def _gen_sql_stmts(self, model):
         """Generate SQL statements for the given model."""
         cache_entry = {}
 
+        # Quote column names
+        quoted = [f"`{col[0]}`" for col in model._fields]
+        cols = ",".join(quoted)
+        cache_entry["field_count"] = len(quoted)
+
         # Generate insert statement
-        cols = ",".join([f"`{col[0]}`" for col in model._fields])
-        placeholders = ",".join(["%s" for col in model._fields])
+        placeholders = ",".join(["%s"] * len(quoted))
         cache_entry["insert"] = f"INSERT INTO `{model.table}`({cols}) VALUES ({placeholders});"
 
         # Generate update statement
-        cols = ",".join([f"`{col[0]}`=%s" for col in model._fields])
-        cache_entry["update"] = f"UPDATE `{model.table}` SET {cols} WHERE `id`=%s;"
+        assignments = ",".join(f"{col}=%s" for col in quoted)
+        cache_entry["update"] = f"UPDATE `{model.table}` SET {assignments} WHERE `id`=%s;"
 
         # Generate delete statement
         cache_entry["delete"] = f"DELETE FROM `{model.table}` WHERE `id`=%s;"
+        cache_entry["delete_filter"] = f"DELETE FROM `{model.table}`"
 
         # Generate select statement
-        cols = ",".join([f"`{col[0]}`" for col in model._fields])
         cache_entry["select"] = f"SELECT `id`,{cols} FROM `{model.table}`"
 
         # Generate count statement
         cache_entry["count"] = f"SELECT COUNT(`id`) FROM `{model.table}`"
 
+        # Generate exists statement
+        cache_entry["exists"] = f"SELECT 1 FROM `{model.table}`"
+
         # Add cache entry
         self._cache[model] = cache_entry
 
     def connect(self, host, user, passwd, database):
         """Connect to a MySQL/MariaDB database."""
+        # Forget data models initialized for a previous connection
+        self._cache = {}
+
         # Connect to the database and get a cursor object
-        import pymysql
-        from pymysql.cursors import DictCursor
+        pymysql = _import_driver("pymysql")
+
+        self._pool_key = (host, user, passwd, database)
 
-        self._db  = pymysql.connect(host=host, user=user, passwd=passwd, database=database)
-        self._cur = self._db.cursor(DictCursor)
+        try:
+            # Reconnect if the server closed the pooled connection
+            self._db = self._pool[self._pool_key].get_nowait()
+            self._db.ping(reconnect=True)
+
+        except (KeyError, Empty):
+            self._db = pymysql.connect(host=host, user=user, passwd=passwd, database=database)
+
+        self._cur = self._db.cursor()
+
+        # The ID increment of the server is read the first time data models are inserted in bulk
+        self._id_step = None
 
     def disconnect(self):
         """Disconnect from a MySQL/MariaDB database."""
         self._cur.close()
-        self._db.close()
+
+        # Discard uncommitted changes and return the connection to the pool unless it was closed
+        if self._db.open:
+            self._db.rollback()
+            self._pool.setdefault(self._pool_key, LifoQueue()).put(self._db)
+
         self._cur = None
         self._db  = None
 
+    def begin(self):
+        """Begin a transaction."""
+        self._db.begin()
+
     def commit(self):
         """Commit changes to the database."""
         self._db.commit()
@@ -395,266 +1014,256 @@ class MySQLMapper(Mapper):
         """Rollback changes to the database."""
         self._db.rollback()
 
-    def init_model(self, model):
-        """Initialize the table for a data model."""
-        # Build field SQL
-        field_sql = "`id` BIGINT PRIMARY KEY AUTO_INCREMENT,"
-
-        for name, type, length, default in model._fields:
-            # Generate column name
-            col = f"`{name}` "
-
-            # Unsigned?
-            if type & FIELD_TYPE_UNSIGNED:
-                col += "UNSIGNED "
-
-            # Add column type
-            if type & FIELD_TYPE_INT:
-                col += "INT"
-
-            elif type & FIELD_TYPE_BIGINT:
-                col += "BIGINT"
-
-            elif type & FIELD_TYPE_FLOAT:
-                col += "FLOAT"
-
-            elif type & FIELD_TYPE_DOUBLE:
-                col += "FLOAT"
-
-            elif type & FIELD_TYPE_STRING:
-                col += "TEXT"
-
-            elif type & FIELD_TYPE_BLOB:
-                col += "BLOB"
-
-            elif type & FIELD_TYPE_DATETIME:
-                col += "DATETIME"
-
-            elif type & FIELD_TYPE_PSWD:
-                col += "BLOB"
-
-            else:
-                raise InvalidTypeError(f"Field type {type} is not a valid type.")
-
-            # Add length
-            if length:
-                col += f"({length})"
-
-            # Not null?
-            if type & FIELD_TYPE_NOT_NULL:
-                col += f" NOT NULL"
-
-            # Add default value
-            if default is not None:
-                col += f" DEFAULT {default}"
-
-            field_sql += f"{col},"
-
-        if field_sql[-1] == ",":
-            field_sql = field_sql[:-1]
-
-        # Build index SQL
-        index_sql = ""
-        indexes = []
-
-        for index in model._indexes:
-            # Generate index name
-            idx = f"CONSTRAINT `{model.table}_{index[0]}` "
-
-            # Add index type
-            if index[1] & INDEX_TYPE_KEY:
-                # Normal indexes must be created with "CREATE INDEX" in MySQL/MariaDB
-                indexes.append(index)
-                continue
-
-            elif index[1] & INDEX_TYPE_UNIQUE_KEY:
-                fields = ",".join([f"`{field}`" for field in index[2]])
-                idx += f"UNIQUE({fields})"
-
-            elif index[1] & INDEX_TYPE_FOREIGN_KEY:
-                idx += f"FOREIGN KEY(`{index[0][:-4]}`) REFERENCES `{index[2][0]}`(`{index[2][1]}`)"
-
-                # On delete clause
-                idx += " ON DELETE "
-
-                if index[3][0] & FK_SET_NULL:
-                    idx += "SET NULL"
+    def save_model(self, model):
+        """Save the given model to the database.
+        
+        This method will choose to do an insert if the model has not been previously saved. Otherwise it 
+        will perform and update to the existing row in the corresponding database table. Previously saved
+        models without any changed fields are skipped.
+        """
+        cache = self._cache[model.__class__]
 
-                elif index[3][0] & FK_SET_DEFAULT:
-                    idx += "SET DEFAULT"
+        # Has the model been saved previously?
+        if model._id is not None:
+            # Skip the update if no fields have changed since the last save
+            if not model._dirty:
+                return
 
-                elif index[3][0] & FK_CASCADE:
-                    idx += "CASCADE"
+            # Update existing row in the database
+            self._cur.execute(cache["update"], model._data + [model._id])
 
-                elif index[3][0] & FK_RESTRICT:
-                    idx += "RESTRICT"
+        else:
+            # Insert the data model into the table and fetch its ID
+            self._cur.execute(cache["insert"], model._data)
+            model._id = self._cur.lastrowid
 
-                elif index[3][0] & FK_NO_ACTION:
-                    idx += "NO ACTION"
+        model._dirty = 0
 
-                # On update clause
-                idx += " ON UPDATE "
+    def save_models(self, models):
+        """Save the given models to the database.
 
-                if index[3][1] & FK_SET_NULL:
-                    idx += "SET NULL"
+        This method works like "save_model", but it inserts and updates the given models in bulk with a 
+        single statement execution per data model class.
 
-                elif index[3][1] & FK_SET_DEFAULT:
-                    idx += "SET DEFAULT"
+        The IDs of inserted data models are derived from the first ID of each multi-row insert and the server's 
+        "auto_increment_increment". This assumes that the rows of one insert get consecutive IDs, which doesn't 
+        hold with "innodb_autoinc_lock_mode=2" under concurrent inserts into the same table.
+        """
+        for cls, group in _group_by_class(models).items():
+            cache = self._cache[cls]
 
-                elif index[3][1] & FK_CASCADE:
-                    idx += "CASCADE"
+            # Update existing rows in the database
+            updates = [model for model in group if model._id is not None and model._dirty]
 
-                elif index[3][1] & FK_RESTRICT:
-                    idx += "RESTRICT"
+            if updates:
+                values = [model._data + [model._id] for model in updates]
+                self._cur.executemany(cache["update"], values)
 
-                elif index[3][1] & FK_NO_ACTION:
-                    idx += "NO ACTION"
+            # Insert new data models into the table with multi-row inserts and assign their IDs (MySQL/MariaDB 
+            # assigns consecutive IDs to the rows of a multi-row insert, starting at the last insert ID)
+            inserts = [model for model in group if model._id is None]
+            size = max(1, min(_MYSQL_MAX_INSERT_ROWS, _MYSQL_MAX_PARAMS // max(1, cache["field_count"])))
 
-            else:
-                raise InvalidTypeError(f"Index type {index[1]} is not a valid type.")
+            if inserts and self._id_step is None:
+                self._cur.execute("SELECT @@auto_increment_increment;")
+                self._id_step = self._cur.fetchone()[0]
 
-            index_sql += f"{idx},"
+            for start in range(0, len(inserts), size):
+                batch = inserts[start:start + size]
+                values = list(chain.from_iterable(model._data for model in batch))
+                self._cur.execute(_mysql_insert_sql(cache["insert"], len(batch)), values)
+                first_id = self._cur.lastrowid
 
-        if index_sql[-1] == ",":
-            index_sql = index_sql[:-1]
+                for i, model in enumerate(batch):
+                    model._id = first_id + i * self._id_step
 
-        # Build table SQL
-        sql = f"CREATE TABLE IF NOT EXISTS `{model.table}`({field_sql},{index_sql});"
+            for model in updates + inserts:
+                model._dirty = 0
 
-        # Create the table
-        # print(sql)
-        self._cur.execute(sql)
+    def delete_model(self, model):
+        """Delete the given model from the database."""
+        self._cur.execute(self._cache[model.__class__]["delete"], (model._id,))
 
-        # Create normal indexes
-        for index in indexes:
-            fields = ",".join([f"`{field}`" for field in index[2]])
-            sql = f"CREATE INDEX IF NOT EXISTS `{model.table}_{index[0]}` ON `{model.table}`({fields});"
-            self._cur.execute(sql)
+    def delete_models(self, models):
+        """Delete the given models from the database with a single statement per data model class."""
+        for cls, group in _group_by_class(models).items():
+            delete = self._cache[cls]["delete"]
 
-        # Generate SQL statements for the given model
-        self._gen_sql_stmts(model)
+            for start in range(0, len(group), _MYSQL_MAX_PARAMS):
+                ids = [model._id for model in group[start:start + _MYSQL_MAX_PARAMS]]
+                self._cur.execute(_delete_in_sql(delete, len(ids)), ids)
 
-    def save_model(self, model):
-        """Save the given model to the database.
-        
-        This method will choose to do an insert if the model has not been previously saved. Otherwise it 
-        will perform and update to the existing row in the corresponding database table.
+    def delete_filter(self, model, condition, *args):
+        """Delete the data in the database that matches the given condition with a single statement. Returns the 
+        number of deleted rows.
         """
-        # Has the model been saved previously?
-        if "id" in model._data:
-            # Update existing row in the database
-            values = [value for key, value in model._data.items() if key != "id"]
-            values.append(model._data["id"])
-            self._cur.execute(self._cache[model.__class__]["update"], values)
-
-        else:
-            # Insert the data model into the table and fetch its ID
-            values = list(model._data.values())
-            self._cur.execute(self._cache[model.__class__]["insert"], values)
-            model._data["id"] = self._cur.lastrowid
-
-    def delete_model(self, model):
-        """Delete the given model from the database."""
-        self._cur.execute(self._cache[model.__class__]["delete"], (model.id,))
+        sql = _compose_filter_sql(
+            self._cache[model]["delete_filter"],
+            _qmark_to_pyformat(condition),
+            None,
+            None,
+            None,
+            None,
+            self._dialect.quote
+        )
+        self._cur.execute(sql, args)
+        return self._cur.rowcount
+
+    def _filter_sql(self, model, select, condition, **kwargs):
+        """Build the SQL for a filter query on a data model with the given select statement."""
+        order_by, order, limit, offset = _filter_options(model, kwargs)
+
+        return _compose_filter_sql(
+            select,
+            _qmark_to_pyformat(condition),
+            order_by,
+            order,
+            limit,
+            offset,
+            self._dialect.quote
+        )
 
     def filter(self, model, condition="", *args, **kwargs):
         """Filter data in the database."""
-        sql = self._cache[model]["select"]
-
-        # Replace "?" placeholders with "%s" placeholders in the condition format string
-        condition = condition.replace("?", "%s")
-
-        # Is there a condition?
-        if condition != "":
-            sql += f" WHERE {condition}"
+        sql = self._filter_sql(model, self._cache[model]["select"], condition, **kwargs)
 
-        # Are there columns to order by?
-        if "order_by" in kwargs:
-            direction = kwargs.get("order", "ASC")
-            cols = ",".join([f"`{col}`" for col in kwargs["order_by"]])
-            sql += f" ORDER BY {cols} {direction}"
-
-        # Is there a limit?
-        if "limit" in kwargs:
-            sql += f" LIMIT {kwargs['limit']}"
+        # Execute query and build a data model from each row without going through its initializer
+        self._cur.execute(sql, args)
+        return _load_models(model, self._cur)
 
-            # Is there an offset?
-            if "offset" in kwargs:
-                sql += f" OFFSET {kwargs['offset']}"
+    def iter_filter(self, model, condition="", *args, chunksize=1000, **kwargs):
+        """Filter data in the database and yield the results one at a time.
+        
+        The query runs on an unbuffered cursor, so rows are streamed from the server as they are consumed. No 
+        other queries may be performed on this mapper until all of the results have been consumed or the returned 
+        iterator has been closed.
+        """
+        sql = self._filter_sql(model, self._cache[model]["select"], condition, **kwargs)
+        cur = self._db.cursor(_import_driver("pymysql.cursors").SSCursor)
+        return _iter_models(model, cur, sql, args, chunksize)
 
-        sql += ";"
+    def filter_values(self, model, fields, condition="", *args, **kwargs):
+        """Filter data in the database and return only the values of the given fields. Each result is a tuple 
+        of field values in the given order.
+        """
+        sql = self._filter_sql(model, _select_sql(self._dialect, model, tuple(fields)), condition, **kwargs)
 
         # Execute query and fetch results
         self._cur.execute(sql, args)
-        results = [model(**dict(row)) for row in self._cur.fetchall()]
-        return results
+        return list(self._cur)
     
     def count(self, model, condition="", *args, **kwargs):
         """Count data in the database."""
-        sql = self._cache[model]["count"]
-
-        # Replace "?" placeholders with "%s" placeholders in the condition format string
-        condition = condition.replace("?", "%s")
+        sql = _compose_filter_sql(
+            self._cache[model]["count"], _qmark_to_pyformat(condition), None, None, None, None, self._dialect.quote
+        )
 
-        # Is there a condition?
-        if condition != "":
-            sql += f" WHERE {condition}"
+        # Execute query and fetch results
+        self._cur.execute(sql, args)
+        return self._cur.fetchone()[0]
 
-        sql += ";"
+    def exists(self, model, condition="", *args):
+        """Check whether any data in the database matches the given condition. The query stops at the first 
+        matching row instead of counting or fetching all of them.
+        """
+        sql = _compose_filter_sql(
+            self._cache[model]["exists"], _qmark_to_pyformat(condition), None, None, 1, None, self._dialect.quote
+        )
 
-        # Execute query and fetch results
+        # Execute query and check for a result
         self._cur.execute(sql, args)
-        return self._cur.fetchall()[0]["COUNT(`id`)"]
+        return self._cur.fetchone() is not None
     
 
 MariaDBMapper = MySQLMapper
 
 
 class PostgreSQLMapper(Mapper):
-    """A data model mapper for PostgreSQL databases."""
+    """A data model mapper for PostgreSQL databases.
+    
+    The insert, update, and delete statements generated for each data model are prepared on the server the first 
+    time they are executed. Filter and count queries depend on their conditions, so they are left to psycopg, 
+    which prepares a query automatically once it has been executed a few times.
+
+    Connections are pooled like those of the MySQL/MariaDB mapper.
+    """
+    _dialect = _POSTGRESQL_DIALECT
+    _pool    = {}
+
     def _gen_sql_stmts(self, model):
         """Generate SQL statements for the given model."""
         cache_entry = {}
 
+        # Quote column names
+        quoted = [f'"{col[0]}"' for col in model._fields]
+        cols = ",".join(quoted)
+
         # Generate insert statement
-        cols = ",".join([f'"{col[0]}"' for col in model._fields])
-        placeholders = ",".join(["%s" for col in model._fields])
+        placeholders = ",".join(["%s"] * len(quoted))
         cache_entry["insert"] = f'INSERT INTO "{model.table}"({cols}) VALUES ({placeholders}) RETURNING "id";'
 
         # Generate update statement
-        cols = ",".join([f'"{col[0]}"=%s' for col in model._fields])
-        cache_entry["update"] = f'UPDATE "{model.table}" SET {cols} WHERE "id"=%s;'
+        assignments = ",".join(f"{col}=%s" for col in quoted)
+        cache_entry["update"] = f'UPDATE "{model.table}" SET {assignments} WHERE "id"=%s;'
 
         # Generate delete statement
         cache_entry["delete"] = f'DELETE FROM "{model.table}" WHERE "id"=%s;'
+        cache_entry["delete_many"] = f'DELETE FROM "{model.table}" WHERE "id"=ANY(%s);'
+        cache_entry["delete_filter"] = f'DELETE FROM "{model.table}"'
 
         # Generate select statement
-        cols = ",".join([f'"{col[0]}"' for col in model._fields])
         cache_entry["select"] = f'SELECT "id",{cols} FROM "{model.table}"'
 
         # Generate count statement
         cache_entry["count"] = f'SELECT COUNT("id") FROM "{model.table}"'
 
+        # Generate exists statement
+        cache_entry["exists"] = f'SELECT 1 FROM "{model.table}"'
+
         # Add cache entry
         self._cache[model] = cache_entry
 
     def connect(self, host, user, password, dbname):
         """Connect to a PostgreSQL database."""
+        # Forget data models initialized for a previous connection
+        self._cache = {}
+
         # Connect to the database and get a cursor object
-        import psycopg
-        from psycopg.rows import dict_row
+        psycopg = _import_driver("psycopg")
+
+        self._pool_key = (host, user, password, dbname)
+
+        try:
+            self._db = self._pool[self._pool_key].get_nowait()
+
+            # Replace the pooled connection if it was closed or broken
+            if self._db.closed:
+                self._db = psycopg.connect(host=host, user=user, password=password, dbname=dbname)
+
+        except (KeyError, Empty):
+            self._db = psycopg.connect(host=host, user=user, password=password, dbname=dbname)
 
-        self._db  = psycopg.connect(host=host, user=user, password=password, dbname=dbname)
-        self._db.row_factory = dict_row
         self._cur = self._db.cursor()
 
     def disconnect(self):
         """Disconnect from a PostgreSQL database."""
         self._cur.close()
-        self._db.close()
+
+        # Discard uncommitted changes and return the connection to the pool unless it was closed
+        if not self._db.closed:
+            self._db.rollback()
+            self._pool.setdefault(self._pool_key, LifoQueue()).put(self._db)
+
         self._cur = None
         self._db  = None
 
+    def begin(self):
+        """Begin a transaction.
+
+        psycopg opens a transaction implicitly before the first statement, so there is nothing to do here.
+        """
+        pass
+
     def commit(self):
         """Commit changes to the database."""
         self._db.commit()
@@ -663,215 +1272,141 @@ class PostgreSQLMapper(Mapper):
         """Rollback changes to the database."""
         self._db.rollback()
 
-    def init_model(self, model):
-        """Initialize the table for a data model."""
-        # Build field SQL
-        field_sql = '"id" BIGSERIAL PRIMARY KEY,'
-
-        for name, type, length, default in model._fields:
-            # Generate column name
-            col = f'"{name}" '
-
-            # Unsigned?
-            if type & FIELD_TYPE_UNSIGNED:
-                col += "UNSIGNED "
-
-            # Add column type
-            if type & FIELD_TYPE_INT:
-                col += "INT"
-
-            elif type & FIELD_TYPE_BIGINT:
-                col += "BIGINT"
-
-            elif type & FIELD_TYPE_FLOAT:
-                col += "FLOAT"
-
-            elif type & FIELD_TYPE_DOUBLE:
-                col += "FLOAT"
-
-            elif type & FIELD_TYPE_STRING:
-                col += "VARCHAR"
-
-            elif type & FIELD_TYPE_BLOB:
-                col += "BYTEA"
-
-            elif type & FIELD_TYPE_DATETIME:
-                col += "TIMESTAMP"
-
-            elif type & FIELD_TYPE_PSWD:
-                col += "BYTEA"
-
-            else:
-                raise InvalidTypeError(f"Field type {type} is not a valid type.")
-
-            # Add length
-            if length and not (type & FIELD_TYPE_INT or type & FIELD_TYPE_BIGINT or type & FIELD_TYPE_BLOB or type & FIELD_TYPE_PSWD):
-                col += f"({length})"
-
-            # Not null?
-            if type & FIELD_TYPE_NOT_NULL:
-                col += f" NOT NULL"
-
-            # Add default value
-            if default is not None:
-                col += f" DEFAULT {default}"
-
-            field_sql += f"{col},"
-
-        if field_sql[-1] == ",":
-            field_sql = field_sql[:-1]
-
-        # Build index SQL
-        index_sql = ""
-        indexes = []
-
-        for index in model._indexes:
-            # Generate index name
-            idx = f'CONSTRAINT "{model.table}_{index[0]}" '
-
-            # Add index type
-            if index[1] & INDEX_TYPE_KEY:
-                # Normal indexes must be created with "CREATE INDEX" in PostgreSQL
-                indexes.append(index)
-                continue
-
-            elif index[1] & INDEX_TYPE_UNIQUE_KEY:
-                fields = ",".join([f'"{field}"' for field in index[2]])
-                idx += f"UNIQUE({fields})"
-
-            elif index[1] & INDEX_TYPE_FOREIGN_KEY:
-                idx += f'FOREIGN KEY("{index[0][:-4]}") REFERENCES "{index[2][0]}"("{index[2][1]}")'
-
-                # On delete clause
-                idx += " ON DELETE "
-
-                if index[3][0] & FK_SET_NULL:
-                    idx += "SET NULL"
-
-                elif index[3][0] & FK_SET_DEFAULT:
-                    idx += "SET DEFAULT"
-
-                elif index[3][0] & FK_CASCADE:
-                    idx += "CASCADE"
-
-                elif index[3][0] & FK_RESTRICT:
-                    idx += "RESTRICT"
+    def save_model(self, model):
+        """Save the given model to the database.
+        
+        This method will choose to do an insert if the model has not been previously saved. Otherwise it 
+        will perform and update to the existing row in the corresponding database table. Previously saved
+        models without any changed fields are skipped.
+        """
+        cache = self._cache[model.__class__]
 
-                elif index[3][0] & FK_NO_ACTION:
-                    idx += "NO ACTION"
+        # Has the model been saved previously?
+        if model._id is not None:
+            # Skip the update if no fields have changed since the last save
+            if not model._dirty:
+                return
 
-                # On update clause
-                idx += " ON UPDATE "
+            # Update existing row in the database (with a server-side prepared statement)
+            self._cur.execute(cache["update"], model._data + [model._id], prepare=True)
 
-                if index[3][1] & FK_SET_NULL:
-                    idx += "SET NULL"
+        else:
+            # Insert the data model into the table and fetch its ID (with a server-side prepared statement)
+            self._cur.execute(cache["insert"], model._data, prepare=True)
+            model._id = self._cur.fetchone()[0]
 
-                elif index[3][1] & FK_SET_DEFAULT:
-                    idx += "SET DEFAULT"
+        model._dirty = 0
 
-                elif index[3][1] & FK_CASCADE:
-                    idx += "CASCADE"
+    def save_models(self, models):
+        """Save the given models to the database.
 
-                elif index[3][1] & FK_RESTRICT:
-                    idx += "RESTRICT"
+        This method works like "save_model", but it inserts and updates the given models in bulk with a 
+        single statement execution per data model class.
+        """
+        for cls, group in _group_by_class(models).items():
+            cache = self._cache[cls]
 
-                elif index[3][1] & FK_NO_ACTION:
-                    idx += "NO ACTION"
+            # Update existing rows in the database
+            updates = [model for model in group if model._id is not None and model._dirty]
 
-            else:
-                raise InvalidTypeError(f"Index type {index[1]} is not a valid type.")
+            if updates:
+                values = [model._data + [model._id] for model in updates]
+                self._cur.executemany(cache["update"], values)
 
-            index_sql += f"{idx},"
+            # Insert new data models into the table and fetch the ID returned for each row
+            inserts = [model for model in group if model._id is None]
 
-        if index_sql[-1] == ",":
-            index_sql = index_sql[:-1]
+            if inserts:
+                self._cur.executemany(cache["insert"], [model._data for model in inserts], returning=True)
 
-        # Build table SQL
-        sql = f'CREATE TABLE IF NOT EXISTS "{model.table}"({field_sql},{index_sql});'
+                for model in inserts:
+                    model._id = self._cur.fetchone()[0]
+                    self._cur.nextset()
 
-        # Create the table
-        # print(sql)
-        self._cur.execute(sql)
+            for model in updates + inserts:
+                model._dirty = 0
 
-        # Create normal indexes
-        for index in indexes:
-            fields = ",".join([f'"{field}"' for field in index[2]])
-            sql = f'CREATE INDEX IF NOT EXISTS "{model.table}_{index[0]}" ON "{model.table}"({fields});'
-            self._cur.execute(sql)
+    def delete_model(self, model):
+        """Delete the given model from the database."""
+        self._cur.execute(self._cache[model.__class__]["delete"], (model._id,), prepare=True)
 
-        # Generate SQL statements for the given model
-        self._gen_sql_stmts(model)
+    def delete_models(self, models):
+        """Delete the given models from the database with a single statement per data model class."""
+        for cls, group in _group_by_class(models).items():
+            self._cur.execute(self._cache[cls]["delete_many"], ([model._id for model in group],), prepare=True)
 
-    def save_model(self, model):
-        """Save the given model to the database.
-        
-        This method will choose to do an insert if the model has not been previously saved. Otherwise it 
-        will perform and update to the existing row in the corresponding database table.
+    def delete_filter(self, model, condition, *args):
+        """Delete the data in the database that matches the given condition with a single statement. Returns the 
+        number of deleted rows.
         """
-        # Has the model been saved previously?
-        if "id" in model._data:
-            # Update existing row in the database
-            values = [value for key, value in model._data.items() if key != "id"]
-            values.append(model._data["id"])
-            self._cur.execute(self._cache[model.__class__]["update"], values)
-
-        else:
-            # Insert the data model into the table and fetch its ID
-            values = list(model._data.values())
-            self._cur.execute(self._cache[model.__class__]["insert"], values)
-            model._data["id"] = self._cur.fetchall()[0]["id"]
-
-    def delete_model(self, model):
-        """Delete the given model from the database."""
-        self._cur.execute(self._cache[model.__class__]["delete"], (model.id,))
+        sql = _compose_filter_sql(
+            self._cache[model]["delete_filter"], _qmark_to_pg(condition), None, None, None, None, self._dialect.quote
+        )
+        self._cur.execute(sql, args)
+        return self._cur.rowcount
+
+    def _filter_sql(self, model, select, condition, **kwargs):
+        """Build the SQL for a filter query on a data model with the given select statement."""
+        order_by, order, limit, offset = _filter_options(model, kwargs)
+
+        return _compose_filter_sql(
+            select,
+            _qmark_to_pg(condition),
+            order_by,
+            order,
+            limit,
+            offset,
+            self._dialect.quote
+        )
 
     def filter(self, model, condition="", *args, **kwargs):
         """Filter data in the database."""
-        sql = self._cache[model]["select"]
-
-        # Replace "?" placeholders with "%s" placeholders and replace backticks with double quotes in the 
-        # condition format string
-        condition = condition.replace("?", "%s").replace("`", '"')
+        sql = self._filter_sql(model, self._cache[model]["select"], condition, **kwargs)
 
-        # Is there a condition?
-        if condition != "":
-            sql += f" WHERE {condition}"
-
-        # Are there columns to order by?
-        if "order_by" in kwargs:
-            direction = kwargs.get("order", "ASC")
-            cols = ",".join([f'"{col}"' for col in kwargs["order_by"]])
-            sql += f" ORDER BY {cols} {direction}"
+        # Execute query and build a data model from each row without going through its initializer
+        self._cur.execute(sql, args)
+        return _load_models(model, self._cur)
 
-        # Is there a limit?
-        if "limit" in kwargs:
-            sql += f" LIMIT {kwargs['limit']}"
+    def iter_filter(self, model, condition="", *args, chunksize=1000, **kwargs):
+        """Filter data in the database and yield the results one at a time.
+        
+        The query runs on a named server-side cursor, so rows are streamed from the server in chunks of the 
+        given size. The results must be consumed before the current transaction ends.
+        """
+        sql = self._filter_sql(model, self._cache[model]["select"], condition, **kwargs)
 
-            # Is there an offset?
-            if "offset" in kwargs:
-                sql += f" OFFSET {kwargs['offset']}"
+        # psycopg wraps the query in a "DECLARE" statement, so it must not be terminated
+        cur = self._db.cursor(name=f"cheetah_{uuid4().hex}")
+        return _iter_models(model, cur, sql[:-1], args, chunksize)
 
-        sql += ";"
+    def filter_values(self, model, fields, condition="", *args, **kwargs):
+        """Filter data in the database and return only the values of the given fields. Each result is a tuple 
+        of field values in the given order.
+        """
+        sql = self._filter_sql(model, _select_sql(self._dialect, model, tuple(fields)), condition, **kwargs)
 
         # Execute query and fetch results
         self._cur.execute(sql, args)
-        results = [model(**dict(row)) for row in self._cur.fetchall()]
-        return results
+        return list(self._cur)
     
     def count(self, model, condition="", *args, **kwargs):
         """Count data in the database."""
-        sql = self._cache[model]["count"]
+        sql = _compose_filter_sql(
+            self._cache[model]["count"], _qmark_to_pg(condition), None, None, None, None, self._dialect.quote
+        )
 
-        # Replace "?" placeholders with "%s" placeholders and replace backticks with double quotes in the 
-        # condition format string
-        condition = condition.replace("?", "%s").replace("`", '"')
-
-        # Is there a condition?
-        if condition != "":
-            sql += f" WHERE {condition}"
+        # Execute query and fetch results
+        self._cur.execute(sql, args)
+        return self._cur.fetchone()[0]
 
-        sql += ";"
+    def exists(self, model, condition="", *args):
+        """Check whether any data in the database matches the given condition. The query stops at the first 
+        matching row instead of counting or fetching all of them.
+        """
+        sql = _compose_filter_sql(
+            self._cache[model]["exists"], _qmark_to_pg(condition), None, None, 1, None, self._dialect.quote
+        )
 
-        # Execute query and fetch results
+        # Execute query and check for a result
         self._cur.execute(sql, args)
-        return self._cur.fetchall()[0]["count"]
+        return self._cur.fetchone() is not None
@@ -3,14 +3,62 @@
 Migrators are used to keep the structure of tables in a database synced with their corresponding data models.
 """
 
+from functools import lru_cache
 import json
 
 from .constants import *
-from .error import InvalidTypeError
 from .fields import StringField
 from .indexes import UniqueIndex
+from .mappers import _MYSQL_DIALECT, _POSTGRESQL_DIALECT, _column_sql, _column_type_sql, _default_sql
 from .model import DataModel
 
+# Use orjson for serializing migration metadata if it is available
+try:
+    import orjson
+
+    def _dumps(obj):
+        """Serialize the given object as JSON."""
+        return orjson.dumps(obj).decode("utf-8")
+
+    _loads = orjson.loads
+
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+
+# Functions
+# =========
+def _dump_metadata(model):
+    """Serialize the field and index metadata of a data model. The JSON is cached on the data model class."""
+    dumped = model.__dict__.get("_metadata_json")
+
+    if dumped is None:
+        dumped = model._metadata_json = (_dumps(model._fields), _dumps(model._indexes))
+
+    return dumped
+
+
+def _index_map(indexes):
+    """Split parsed index metadata into dictionaries of normal indexes and table constraints keyed by name."""
+    keys = {}
+    constraints = {}
+
+    for index in indexes or ():
+        if index[1] & INDEX_TYPE_KEY:
+            keys[index[0]] = index[1:]
+
+        else:
+            constraints[index[0]] = index[1:]
+
+    return keys, constraints
+
+
+@lru_cache(maxsize=256)
+def _load_metadata(fields, indexes):
+    """Parse serialized field and index metadata. The result is cached and must not be modified."""
+    return _loads(fields), _loads(indexes)
+
 
 # Data Models
 # ===========
@@ -25,362 +73,219 @@ class MigrationMetadata(DataModel):
 # Classes
 # =======
 class Migrator(object):
-    """Base class for a migrator."""
+    """Base class for a migrator.
+    
+    The base class migrates a data model by altering its table in place. Derived classes set "_dialect" to the 
+    dialect of their database system and override "_modify_clauses" to generate the clauses that change the 
+    definition of an existing column.
+    """
+    _dialect = None
+
     def __init__(self, mapper):
         """Setup this migrator."""
         self._mapper = mapper
         mapper.init_model(MigrationMetadata)
 
-    def migrate(self, model):
-        """Migrate a data model if necessary."""
-        pass
-
-
-class SQLiteMigrator(Migrator):
-    """An SQLite migrator."""
-    def migrate(self, model):
-        """Migrate a data model if necessary."""
+    def _modify_clauses(self, name, type, length, default):
+        """Generate the ALTER TABLE clauses that change the definition of an existing column.
+        
+        This should be overridden by a derived class.
+        """
+        return []
+
+    def _alter_table(self, model, fields):
+        """Alter the table of a data model to match the data model. The fields are the field metadata of the 
+        data model when it was last migrated.
+        """
+        q = self._dialect.quote
+
+        # Convert field metadata to dictionaries
+        fields1 = {field[0]: field[1:] for field in fields}
+        fields2 = {field[0]: field[1:] for field in model._fields}
+
+        # Check fields for changes and collect the column changes
+        clauses = []
+
+        for name in fields1:
+            # Was this field removed?
+            if name not in fields2:
+                clauses.append(f"DROP COLUMN {q}{name}{q}")
+
+        for name, (type, length, default) in fields2.items():
+            # Was this field added?
+            if name not in fields1:
+                clauses.append(f"ADD COLUMN {_column_sql(self._dialect, name, type, length, default)}")
+
+            # Check if the field was modified
+            elif fields1[name] != [type, length, default]:
+                clauses.extend(self._modify_clauses(name, type, length, default))
+
+        # Apply all column changes with a single statement
+        if clauses:
+            self._mapper._cur.execute(f"ALTER TABLE {q}{model.table}{q} {', '.join(clauses)};")
+
+    def _create_metadata(self, model):
+        """Create the migration metadata of a data model."""
+        fields, indexes = _dump_metadata(model)
+        metadata = MigrationMetadata(name=model.table, fields=fields, indexes=indexes)
+        self._mapper.save_model(metadata)
+
+    def _migrate(self, model, metadata):
+        """Migrate a data model if necessary. The metadata is the data model's migration metadata or None if 
+        there is none yet.
+        """
         # Does migration metadata for the given data model exist?
-        records = self._mapper.filter(MigrationMetadata, "`name`=?", model.table)
-
-        if len(records):
-            # Fetch migration metadata and import it
-            metadata = records[0]
-            fields = json.loads(metadata.fields)
-            indexes = json.loads(metadata.indexes)
-
-            # Has the data model changed?
-            if fields != model._fields or indexes != model._indexes:
-                # Rename the old table
-                self._mapper._cur.execute(f"ALTER TABLE `{model.table}` RENAME TO `tmp_{model.table}`;")
-
-                # Initialize new data model
-                self._mapper.init_model(model)
-
-                # Generate migration SQL
-                field_names1 = [f"`{field[0]}`" for field in fields]
-                field_names2 = [f"`{field[0]}`" for field in model._fields]
-                fields = list(set(field_names1).intersection(field_names2))
-                field_sql = ",".join(fields)
-                sql = f"INSERT INTO `{model.table}`({field_sql}) SELECT {field_sql} FROM `tmp_{model.table}`;"
-
-                # Migrate data
-                self._mapper._cur.execute(sql)
-                self._mapper.commit()
-
-                # Drop old table
-                self._mapper._cur.execute(f"DROP TABLE `tmp_{model.table}`;")
-
-                # Update migration metadata
-                metadata.fields = json.dumps(model._fields)
-                metadata.indexes = json.dumps(model._indexes)
-                self._mapper.save_model(metadata)
-                self._mapper.commit()
+        if metadata is None:
+            self._create_metadata(model)
+            return
 
-        else:
-            # Create migration metadata
-            metadata = MigrationMetadata(
-                name=model.table,
-                fields=json.dumps(model._fields),
-                indexes=json.dumps(model._indexes)
-            )
-            self._mapper.save_model(metadata)
-            self._mapper.commit()
+        # Skip the migration if the migration metadata is identical to the data model's metadata
+        if (metadata.fields, metadata.indexes) == _dump_metadata(model):
+            return
 
+        # Alter the table
+        fields, indexes = _load_metadata(metadata.fields, metadata.indexes)
+        self._alter_table(model, fields)
+
+        # Update migration metadata
+        metadata.fields, metadata.indexes = _dump_metadata(model)
+        self._mapper.save_model(metadata)
 
-class MySQLMigrator(Migrator):
-    """A MySQL migrator."""
     def migrate(self, model):
         """Migrate a data model if necessary."""
-        # Does migration metadata for the given data model exist?
-        records = self._mapper.filter(MigrationMetadata, "`name`=?", model.table)
-
-        if len(records):
-            # Fetch migration metadata and import it
-            metadata = records[0]
-            fields = json.loads(metadata.fields)
-            indexes = json.loads(metadata.indexes)
-
-            # Convert field metadata to dictionaries
-            fields1 = {field[0]: field[1:] for field in fields}
-            fields2 = {field[0]: field[1:] for field in model._fields}
-
-            # Check fields for changes
-            for name, (type, length, default) in fields1.items():
-                # Was this field removed?
-                if name not in fields2:
-                    self._mapper._cur.execute(f"ALTER TABLE `{model.table}` DROP COLUMN `{name}`;")
-
-            for name, (type, length, default) in fields2.items():
-                # Was this field added?
-                if name not in fields1:
-                    # Generate column name
-                    col = f"`{name}` "
-
-                    # Unsigned?
-                    if type & FIELD_TYPE_UNSIGNED:
-                        col += "UNSIGNED "
-
-                    # Add column type
-                    if type & FIELD_TYPE_INT:
-                        col += "INT"
-
-                    elif type & FIELD_TYPE_BIGINT:
-                        col += "BIGINT"
-
-                    elif type & FIELD_TYPE_FLOAT:
-                        col += "FLOAT"
-
-                    elif type & FIELD_TYPE_DOUBLE:
-                        col += "FLOAT"
-
-                    elif type & FIELD_TYPE_STRING:
-                        col += "TEXT"
-
-                    elif type & FIELD_TYPE_BLOB:
-                        col += "BLOB"
-
-                    elif type & FIELD_TYPE_DATETIME:
-                        col += "DATETIME"
-
-                    elif type & FIELD_TYPE_PSWD:
-                        col += "BLOB"
-
-                    else:
-                        raise InvalidTypeError(f"Field type {type} is not a valid type.")
-
-                    # Add length
-                    if length:
-                        col += f"({length})"
-
-                    # Not null?
-                    if type & FIELD_TYPE_NOT_NULL:
-                        col += f" NOT NULL"
-
-                    # Add default value
-                    if default is not None:
-                        col += f" DEFAULT {default}"
-
-                    # Add the new column
-                    self._mapper._cur.execute(f"ALTER TABLE `{model.table}` ADD COLUMN {col};")
-
-                # Check if the field was modified
-                elif fields1[name] != [type, length, default]:
-                    # Generate column name
-                    col = f"`{name}` "
-
-                    # Unsigned?
-                    if type & FIELD_TYPE_UNSIGNED:
-                        col += "UNSIGNED "
-
-                    # Add column type
-                    if type & FIELD_TYPE_INT:
-                        col += "INT"
+        self.migrate_many([model])
 
-                    elif type & FIELD_TYPE_BIGINT:
-                        col += "BIGINT"
+    def migrate_many(self, models):
+        """Migrate several data models if necessary. The migration metadata of all of the data models is 
+        fetched with a single query, and the changes are committed once after all of them were migrated.
+        """
+        models = list(models)
 
-                    elif type & FIELD_TYPE_FLOAT:
-                        col += "FLOAT"
+        if not models:
+            return
 
-                    elif type & FIELD_TYPE_DOUBLE:
-                        col += "FLOAT"
+        # Fetch the migration metadata of each data model
+        placeholders = ",".join("?" * len(models))
+        records = self._mapper.filter(
+            MigrationMetadata, 
+            f"`name` IN ({placeholders})", 
+            *[model.table for model in models]
+        )
+        metadata = {record.name: record for record in records}
 
-                    elif type & FIELD_TYPE_STRING:
-                        col += "TEXT"
+        # Migrate each data model
+        for model in models:
+            self._migrate(model, metadata.get(model.table))
 
-                    elif type & FIELD_TYPE_BLOB:
-                        col += "BLOB"
+        self._mapper.commit()
 
-                    elif type & FIELD_TYPE_DATETIME:
-                        col += "DATETIME"
 
-                    elif type & FIELD_TYPE_PSWD:
-                        col += "BLOB"
-
-                    else:
-                        raise InvalidTypeError(f"Field type {type} is not a valid type.")
-
-                    # Add length
-                    if length:
-                        col += f"({length})"
-
-                    # Not null?
-                    if type & FIELD_TYPE_NOT_NULL:
-                        col += f" NOT NULL"
-
-                    # Add default value
-                    if default is not None:
-                        col += f" DEFAULT {default}"
-
-                    # Modify the column
-                    self._mapper._cur.execute(f"ALTER TABLE `{model.table}` MODIFY COLUMN {col};")
-                
-
-            # Update migration metadata
-            metadata.fields = json.dumps(model._fields)
-            metadata.indexes = json.dumps(model._indexes)
-            self._mapper.save_model(metadata)
-            self._mapper.commit()
-
-        else:
-            # Create migration metadata
-            metadata = MigrationMetadata(
-                name=model.table,
-                fields=json.dumps(model._fields),
-                indexes=json.dumps(model._indexes)
-            )
-            self._mapper.save_model(metadata)
-            self._mapper.commit()
-
-
-class PostgreSQLMigrator(Migrator):
-    """A PostgreSQL migrator."""
-    def migrate(self, model):
+class SQLiteMigrator(Migrator):
+    """An SQLite migrator."""
+    def _migrate_indexes(self, model, indexes):
+        """Migrate the normal indexes of a data model without rebuilding its table. The indexes are the index 
+        metadata of the data model when it was last migrated.
+        """
+        keys = _index_map(indexes)[0]
+        new_keys = _index_map(_load_metadata(*_dump_metadata(model))[1])[0]
+
+        # Drop normal indexes which were removed or modified
+        for name, index in keys.items():
+            if new_keys.get(name) != index:
+                self._mapper._cur.execute(f"DROP INDEX IF EXISTS `{model.table}_{name}`;")
+
+        # Create the missing normal indexes
+        for sql in self._mapper._table_ddl(model)[1:]:
+            self._mapper._cur.execute(sql)
+
+    def _rebuild_table(self, model, fields):
+        """Rebuild the table of a data model and copy its data. The fields are the field metadata of the data 
+        model when it was last migrated.
+        """
+        # Rename the old table
+        self._mapper._cur.execute(f"ALTER TABLE `{model.table}` RENAME TO `tmp_{model.table}`;")
+
+        # Initialize new data model
+        self._mapper.init_model(model, force=True)
+
+        # Generate migration SQL for the fields kept by the data model
+        kept_names = model._field_names.intersection(field[0] for field in fields)
+        field_sql = ",".join(f"`{field[0]}`" for field in model._fields if field[0] in kept_names)
+        sql = f"INSERT INTO `{model.table}`({field_sql}) SELECT {field_sql} FROM `tmp_{model.table}`;"
+
+        # Migrate data
+        self._mapper._cur.execute(sql)
+
+        # Drop old table
+        self._mapper._cur.execute(f"DROP TABLE `tmp_{model.table}`;")
+
+    def _migrate(self, model, metadata):
         """Migrate a data model if necessary."""
         # Does migration metadata for the given data model exist?
-        records = self._mapper.filter(MigrationMetadata, "`name`=?", model.table)
-
-        if len(records):
-            # Fetch migration metadata and import it
-            metadata = records[0]
-            fields = json.loads(metadata.fields)
-            indexes = json.loads(metadata.indexes)
-
-            # Convert field metadata to dictionaries
-            fields1 = {field[0]: field[1:] for field in fields}
-            fields2 = {field[0]: field[1:] for field in model._fields}
-
-            # Check fields for changes
-            for name, (type, length, default) in fields1.items():
-                # Was this field removed?
-                if name not in fields2:
-                    self._mapper._cur.execute(f'ALTER TABLE "{model.table}" DROP COLUMN "{name}";')
-
-            for name, (type, length, default) in fields2.items():
-                # Was this field added?
-                if name not in fields1:
-                    # Generate column name
-                    col = f'"{name}" '
-
-                    # Unsigned?
-                    if type & FIELD_TYPE_UNSIGNED:
-                        col += "UNSIGNED "
-
-                    # Add column type
-                    if type & FIELD_TYPE_INT:
-                        col += "INT"
-
-                    elif type & FIELD_TYPE_BIGINT:
-                        col += "BIGINT"
-
-                    elif type & FIELD_TYPE_FLOAT:
-                        col += "FLOAT"
-
-                    elif type & FIELD_TYPE_DOUBLE:
-                        col += "FLOAT"
-
-                    elif type & FIELD_TYPE_STRING:
-                        col += "VARCHAR"
-
-                    elif type & FIELD_TYPE_BLOB:
-                        col += "BYTEA"
-
-                    elif type & FIELD_TYPE_DATETIME:
-                        col += "TIMESTAMP"
-
-                    elif type & FIELD_TYPE_PSWD:
-                        col += "BYTEA"
+        if metadata is not None:
+            # Skip the migration if the migration metadata is identical to the data model's metadata
+            if (metadata.fields, metadata.indexes) == _dump_metadata(model):
+                return
+
+            # Import migration metadata
+            fields, indexes = _load_metadata(metadata.fields, metadata.indexes)
+            new_fields, new_indexes = _load_metadata(*_dump_metadata(model))
+
+            # Has the data model changed? (the metadata is compared in parsed form, since the stored JSON may have 
+            # been serialized differently)
+            if (fields, indexes) != (new_fields, new_indexes):
+                # Migrate the table in a single transaction
+                with self._mapper.transaction():
+                    # The table only needs to be rebuilt if its columns or constraints changed (column order 
+                    # doesn't matter since all statements name their columns)
+                    if (
+                        {field[0]: field[1:] for field in fields} == {field[0]: field[1:] for field in new_fields} and 
+                        _index_map(indexes)[1] == _index_map(new_indexes)[1]
+                    ):
+                        self._migrate_indexes(model, indexes)
 
                     else:
-                        raise InvalidTypeError(f"Field type {type} is not a valid type.")
-
-                    # Add length
-                    if length and not (type & FIELD_TYPE_INT or type & FIELD_TYPE_BIGINT or type & FIELD_TYPE_BLOB or type & FIELD_TYPE_PSWD):
-                        col += f"({length})"
-
-                    # Not null?
-                    if type & FIELD_TYPE_NOT_NULL:
-                        col += f" NOT NULL"
-
-                    # Add default value
-                    if default is not None:
-                        col += f" DEFAULT {default}"
-
-                    # Add the new column
-                    self._mapper._cur.execute(f'ALTER TABLE "{model.table}" ADD COLUMN {col};')
-
-                # Check if the field was modified
-                elif fields1[name] != [type, length, default]:
-                    # Generate column name
-                    col = ""
-
-                    # Unsigned?
-                    if type & FIELD_TYPE_UNSIGNED:
-                        col += "UNSIGNED "
-
-                    # Add column type
-                    if type & FIELD_TYPE_INT:
-                        col += "INT"
-
-                    elif type & FIELD_TYPE_BIGINT:
-                        col += "BIGINT"
-
-                    elif type & FIELD_TYPE_FLOAT:
-                        col += "FLOAT"
-
-                    elif type & FIELD_TYPE_DOUBLE:
-                        col += "FLOAT"
+                        self._rebuild_table(model, fields)
 
-                    elif type & FIELD_TYPE_STRING:
-                        col += "VARCHAR"
+                    # Update migration metadata
+                    metadata.fields, metadata.indexes = _dump_metadata(model)
+                    self._mapper.save_model(metadata)
 
-                    elif type & FIELD_TYPE_BLOB:
-                        col += "BYTEA"
-
-                    elif type & FIELD_TYPE_DATETIME:
-                        col += "TIMESTAMP"
+        else:
+            # Create migration metadata
+            self._create_metadata(model)
 
-                    elif type & FIELD_TYPE_PSWD:
-                        col += "BYTEA"
 
-                    else:
-                        raise InvalidTypeError(f"Field type {type} is not a valid type.")
+class MySQLMigrator(Migrator):
+    """A MySQL migrator."""
+    _dialect = _MYSQL_DIALECT
 
-                    # Add length
-                    if length and not (type & FIELD_TYPE_INT or type & FIELD_TYPE_BIGINT or type & FIELD_TYPE_BLOB or type & FIELD_TYPE_PSWD):
-                        col += f"({length})"
+    def _modify_clauses(self, name, type, length, default):
+        """Generate the ALTER TABLE clauses that change the definition of an existing column."""
+        return [f"MODIFY COLUMN {_column_sql(self._dialect, name, type, length, default)}"]
 
-                    # Modify the column type
-                    self._mapper._cur.execute(f'ALTER TABLE "{model.table}" ALTER COLUMN "{name}" TYPE {col};')
 
-                    # Not null?
-                    if type & FIELD_TYPE_NOT_NULL:
-                        self._mapper._cur.execute(f'ALTER TABLE "{model.table}" ALTER COLUMN "{name}" SET NOT NULL;')
+class PostgreSQLMigrator(Migrator):
+    """A PostgreSQL migrator."""
+    _dialect = _POSTGRESQL_DIALECT
 
-                    else:
-                        self._mapper._cur.execute(f'ALTER TABLE "{model.table}" ALTER COLUMN "{name}" DROP NOT NULL;')
+    def _modify_clauses(self, name, type, length, default):
+        """Generate the ALTER TABLE clauses that change the definition of an existing column."""
+        # Modify the column type
+        clauses = [f'ALTER COLUMN "{name}" TYPE {_column_type_sql(self._dialect, type, length)}']
 
-                    # Add default value?
-                    if default is not None:
-                        self._mapper._cur.execute(f'ALTER TABLE "{model.table}" ALTER COLUMN "{name}" SET DEFAULT {default};')
+        # Not null?
+        if type & FIELD_TYPE_NOT_NULL:
+            clauses.append(f'ALTER COLUMN "{name}" SET NOT NULL')
 
-                    else:
-                        self._mapper._cur.execute(f'ALTER TABLE "{model.table}" ALTER COLUMN "{name}" SET DEFAULT NULL;')
-                
+        else:
+            clauses.append(f'ALTER COLUMN "{name}" DROP NOT NULL')
 
-            # Update migration metadata
-            metadata.fields = json.dumps(model._fields)
-            metadata.indexes = json.dumps(model._indexes)
-            self._mapper.save_model(metadata)
-            self._mapper.commit()
+        # Add default value?
+        if default is not None:
+            clauses.append(f'ALTER COLUMN "{name}" SET DEFAULT {_default_sql(self._dialect, default)}')
 
         else:
-            # Create migration metadata
-            metadata = MigrationMetadata(
-                name=model.table,
-                fields=json.dumps(model._fields),
-                indexes=json.dumps(model._indexes)
-            )
-            self._mapper.save_model(metadata)
-            self._mapper.commit()
+            clauses.append(f'ALTER COLUMN "{name}" SET DEFAULT NULL')
+
+        return clauses
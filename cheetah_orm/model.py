@@ -3,7 +3,9 @@
 The data model class should be used as the base class for any data model. In order to properly map
 a data model to a table, you should set the table attribute of each derived data model class to the 
 name of the table the data model should be associated with. You also need to add one additional 
-attribute for each field and index.
+attribute for each field and index. Data models store their field values in a list indexed by field
+position and keep it in a slot, so a derived class can also set "__slots__ = ()" to drop the
+per-instance attribute dictionary entirely.
 
 
 Example:
@@ -19,32 +21,141 @@ class User(DataModel):
     email    = UniqueIndex("email")
 """
 
-from collections import OrderedDict
+from keyword import iskeyword
+
+from .fields import Field
+from .indexes import ForeignKey, Index
+
+
+# Constants
+# =========
+_INIT_NAMES = frozenset(("self", "id", "kwargs", "setattr"))    # names used by generated initializers
+
+
+# Functions
+# =========
+def _gen_init(model):
+    """Generate an initializer for the given data model.
+
+    The generated initializer takes one keyword argument per field and builds the field values directly 
+    instead of looping over the field metadata and dispatching through setattr. Only fields that convert their 
+    values when set are assigned through their descriptors. A data model created with an ID starts with every 
+    field marked as changed, so saving it updates the existing row.
+    """
+    fields = model._fields or []
+    params = "".join(f", {field[0]}=_defaults[{i}]" for i, field in enumerate(fields))
+    converted = set(model._converted)
+    data = ", ".join("None" if i in converted else field[0] for i, field in enumerate(fields))
+    assignments = "".join(f"    self.{fields[i][0]} = {fields[i][0]}\n" for i in model._converted)
+    src = (
+        f"def __init__(self, *, id=None{params}, **kwargs):\n"
+        f"    self._id = id\n"
+        f"    self._data = [{data}]\n"
+        f"    self._dirty = 0 if id is None else {model._all_dirty}\n"
+        f"{assignments}"
+        f"    for key, value in kwargs.items():\n"
+        f"        setattr(self, key, value)\n"
+    )
+
+    # Compile the initializer
+    namespace = {"_defaults": [field[3] for field in fields]}
+    exec(src, namespace)
+    init = namespace["__init__"]
+    init.__qualname__ = f"{model.__qualname__}.__init__"
+    init.__doc__ = "Setup this data model."
+    init._generated = True
+    return init
 
 
 # Classes
 # =======
 class DataModel(object):
     """Base class for a data model."""
-    table    = None
-    _fields  = None
-    _indexes = None
+    __slots__ = ("_id", "_data", "_dirty")
+
+    table         = None
+    _fields       = None
+    _indexes      = None
+    _initial_data = ()
+    _converted    = ()
+    _field_names  = frozenset()
+    _all_dirty    = 0
 
     def __init__(self, **kwargs):
         """Setup this data model."""
-        self._data = OrderedDict()
+        self._id = None
+        self._data = list(self._initial_data)
+        self._dirty = 0
 
-        # Initialize default values
-        for field in self._fields:
+        # Initialize default values of fields that convert their values when set
+        for i in self._converted:
+            field = self._fields[i]
             setattr(self, field[0], field[3])
 
         # Pass keyword args to the corresponding fields
         for key, value in kwargs.items():
             setattr(self, key, value)
 
+        # Mark every field as changed if an ID was given so that saving updates the existing row
+        if self._id is not None:
+            self._dirty = self._all_dirty
+
+    def __init_subclass__(cls, **kwargs):
+        """Collect the metadata of a derived data model and specialize it."""
+        super().__init_subclass__(**kwargs)
+
+        # Give the data model its own copy of the inherited metadata
+        cls._fields  = list(cls._fields or [])
+        cls._indexes = list(cls._indexes or [])
+
+        # Add the metadata for each field and index defined by the data model
+        names = [field[0] for field in cls._fields]
+
+        for name, value in vars(cls).items():
+            if isinstance(value, Field):
+                # Fields redefined by the data model keep the position of the inherited field
+                if name in names:
+                    value.index = names.index(name)
+                    cls._fields[value.index] = value._metadata()
+
+                else:
+                    value.index = len(cls._fields)
+                    cls._fields.append(value._metadata())
+
+            elif isinstance(value, (Index, ForeignKey)):
+                cls._indexes.append(value._metadata())
+
+        # Precompute the set of field names and the dirty mask with every field marked as changed
+        cls._field_names = frozenset(field[0] for field in cls._fields)
+        cls._all_dirty = (1 << len(cls._fields)) - 1
+
+        # Precompute the initial field values. Fields that convert their values when set (like datetime and 
+        # password fields) are left empty and must still be initialized through their descriptors.
+        cls._initial_data = []
+        cls._converted = []
+
+        for i, field in enumerate(cls._fields):
+            if type(getattr(cls, field[0])).__set__ is Field.__set__:
+                cls._initial_data.append(field[3])
+
+            else:
+                cls._initial_data.append(None)
+                cls._converted.append(i)
+
+        # Generate an initializer unless the data model defines or inherits a custom one. Data models with field 
+        # names that can't be used as parameters of the generated initializer use the generic one instead.
+        if cls.__init__ is DataModel.__init__ or getattr(cls.__init__, "_generated", False):
+            if any(iskeyword(field[0]) or field[0] in _INIT_NAMES for field in cls._fields):
+                cls.__init__ = DataModel.__init__
+
+            else:
+                cls.__init__ = _gen_init(cls)
+
     def __str__(self):
         """Return the string representation of this data model."""
-        return f"{self.__class__.__name__}({self._data})"
+        data = {"id": self._id} if self._id is not None else {}
+        data.update(zip((field[0] for field in self._fields), self._data))
+        return f"{self.__class__.__name__}({data})"
     
     def __repr__(self):
         """Return the string representation of this data model."""
@@ -52,10 +163,14 @@ class DataModel(object):
 
     def _get_id(self):
         """Get the ID of this data model."""
-        return self._data["id"]
+        return self._id
     
     def _set_id(self, value):
-        """Set the ID of this data model."""
-        self._data["id"] = value
+        """Set the ID of this data model. Changing the ID marks every field as changed, so saving the data model 
+        updates the row with the new ID.
+        """
+        if value != self._id:
+            self._id = value
+            self._dirty = self._all_dirty
     
     id = property(_get_id, _set_id)
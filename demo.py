@@ -104,12 +104,7 @@ unknown = User(
     answer=""
 )
 
-mapper.save_model(daniel)
-mapper.save_model(leila)
-mapper.save_model(james)
-mapper.save_model(abby)
-mapper.save_model(fiona)
-mapper.save_model(unknown)
+mapper.save_models([daniel, leila, james, abby, fiona, unknown])
 mapper.commit()
 
 # Update the models and save them
@@ -119,22 +114,17 @@ james.question = "Favorite animal?"
 abby.question = "Favorite animal?"
 fiona.question = "Favorite animal?"
 
-mapper.save_model(daniel)
-mapper.save_model(leila)
-mapper.save_model(james)
-mapper.save_model(abby)
-mapper.save_model(fiona)
+mapper.save_models([daniel, leila, james, abby, fiona])
 mapper.commit()
 
 # Delete a model
 mapper.delete_model(User(id=6))
 mapper.commit()
 
-# Fetch all users
-users = mapper.filter(User)
+# Fetch all users (one chunk of rows at a time)
 print("Users:")
 
-for user in users:
+for user in mapper.iter_filter(User):
     print(user)
 
 print()
@@ -149,7 +139,7 @@ for user in users:
 print()
 
 # Fetch Leila and Abby
-users = mapper.filter(User, "`name`=? OR `name`=?", "Leila", "Abby")
+users = mapper.filter(User, "`name` IN (?,?)", "Leila", "Abby")
 print("Users Named 'Leila' or 'Abby':")
 
 for user in users:
@@ -175,48 +165,17 @@ for user in users:
 
 print()
 
-# Create some posts
-post = Post(
-    user=daniel.id,
-    content="Hello everyone!"
-)
-mapper.save_model(post)
-
-post = Post(
-    user=leila.id,
-    content="Hello!"
-)
-mapper.save_model(post)
-
-post = Post(
-    user=james.id,
-    content="Hi!"
-)
-mapper.save_model(post)
-
-post = Post(
-    user=abby.id,
-    content="Heya!"
-)
-mapper.save_model(post)
-
-post = Post(
-    user=fiona.id,
-    content="Hello darling!"
-)
-mapper.save_model(post)
-
-post = Post(
-    user=fiona.id,
-    content="Huh? ...Help!"
-)
-mapper.save_model(post)
-
-post = Post(
-    user=daniel.id,
-    content="Oh no!"
-)
-mapper.save_model(post)
+# Create some posts and save them
+posts = [
+    Post(user=daniel.id, content="Hello everyone!"),
+    Post(user=leila.id, content="Hello!"),
+    Post(user=james.id, content="Hi!"),
+    Post(user=abby.id, content="Heya!"),
+    Post(user=fiona.id, content="Hello darling!"),
+    Post(user=fiona.id, content="Huh? ...Help!"),
+    Post(user=daniel.id, content="Oh no!")
+]
+mapper.save_models(posts)
 
 # Now delete a user
 mapper.delete_model(fiona)
@@ -12,6 +12,8 @@ from cheetah_orm.fields import (
     FloatField, 
     DoubleField, 
     IntField, 
+    NOW,
+    Password,
     PasswordField, 
     StringField
 )
@@ -174,3 +176,88 @@ class TestDataModel(unittest.TestCase):
                 ("user_idx", INDEX_TYPE_FOREIGN_KEY, (User.table, "id"), (FK_CASCADE, FK_RESTRICT))
             ]
         )
+
+    def test_7_now(self):
+        """Test current date and time values."""
+        # Define a data model
+        class Event(DataModel):
+            start = DateTimeField(default=NOW)
+            end   = DateTimeField()
+
+        # Create an instance
+        before = datetime.now()
+        e = Event(end=NOW)
+
+        # Verify field metadata and values
+        self.assertEqual(Event._fields[0][3], "now()")
+        self.assertTrue(before <= e.start <= datetime.now())
+        self.assertTrue(before <= e.end <= datetime.now())
+
+    def test_8_password_hashing(self):
+        """Test hashing passwords ahead of time."""
+        # Define a data model
+        class Account(DataModel):
+            pswd = PasswordField(rounds=1000)
+
+        # Hash some passwords in parallel and assign the hashes
+        hashes = Account.pswd.hash_many(["lion", "cheetah"])
+        accounts = [Account(pswd=hash) for hash in hashes]
+
+        # Ensure that the hashes were stored as-is
+        self.assertEqual(accounts[0].pswd.value, hashes[0].value)
+        self.assertTrue(accounts[0].pswd == "lion")
+        self.assertTrue(accounts[1].pswd == "cheetah")
+
+        # Ensure that copying a password between data models keeps its hash
+        accounts[1].pswd = accounts[0].pswd
+        self.assertEqual(accounts[1].pswd.value, hashes[0].value)
+
+        # Ensure that password objects which don't hold a hash are hashed
+        accounts[1].pswd = Password("hunter2")
+        self.assertNotEqual(accounts[1].pswd.value, "hunter2")
+        self.assertTrue(accounts[1].pswd == "hunter2")
+
+        # Ensure that strings which look like hashes are still hashed
+        account = Account(pswd="$pbkdf2-sha256$not-a-hash")
+        self.assertTrue(account.pswd == "$pbkdf2-sha256$not-a-hash")
+
+    def test_9_inheritance(self):
+        """Test data model inheritance."""
+        # Define a data model and derive another one from it
+        class Point(DataModel):
+            x = IntField()
+            y = IntField()
+
+        class Point3D(Point):
+            z = IntField()
+
+        # Ensure that each data model has its own field metadata
+        self.assertEqual([field[0] for field in Point._fields], ["x", "y"])
+        self.assertEqual([field[0] for field in Point3D._fields], ["x", "y", "z"])
+
+        # Ensure that inherited fields work in the derived data model
+        p = Point3D(x=1, y=2, z=3)
+        self.assertEqual((p.x, p.y, p.z), (1, 2, 3))
+
+        # Ensure that a data model derived from one with a custom initializer keeps it
+        class Tagged(DataModel):
+            __slots__ = ("tag",)
+            name = StringField()
+
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self.tag = "custom"
+
+        class TaggedPoint(Tagged):
+            x = IntField()
+
+        p = TaggedPoint(name="a", x=1)
+        self.assertEqual((p.tag, p.name, p.x), ("custom", "a", 1))
+
+        # Ensure that fields named like the parameters of the generated initializer still work
+        class Options(DataModel):
+            kwargs  = StringField()
+            setattr = IntField()
+
+        o = Options(kwargs="a", setattr=1)
+        self.assertEqual((o.kwargs, o.setattr), ("a", 1))
@@ -14,6 +14,7 @@ from cheetah_orm.fields import (
     StringField
 )
 from cheetah_orm.indexes import ForeignKey, Index, UniqueIndex
+from cheetah_orm.error import InvalidParamsError
 from cheetah_orm.mappers import MySQLMapper
 from cheetah_orm.model import DataModel
 
@@ -59,10 +60,16 @@ class TestMySQLMapper(unittest.TestCase):
         # Establish a database connection
         mapper = MySQLMapper()
         mapper.connect(host="localhost", user="tester", passwd="test", database="testing")
+        db = mapper._db
 
         # Disconnect from the database
         mapper.disconnect()
 
+        # Reconnect and check that the pooled connection is reused
+        mapper.connect(host="localhost", user="tester", passwd="test", database="testing")
+        self.assertIs(mapper._db, db)
+        mapper.disconnect()
+
     def test_2_init_model(self):
         """Test data model initialization."""
         # Establish a database connection
@@ -228,6 +235,31 @@ class TestMySQLMapper(unittest.TestCase):
         self.assertEqual(users[0].name, "Daniel")
         self.assertEqual(users[1].name, "Fiona")
 
+        # Stream all users ordered by username in small chunks
+        names = [user.name for user in mapper.iter_filter(User, order_by=["name"], chunksize=2)]
+        self.assertEqual(names, [user.name for user in mapper.filter(User, order_by=["name"])])
+
+        # Stop consuming the streamed users early and check that other queries still work
+        users = mapper.iter_filter(User, order_by=["name"], chunksize=2)
+        self.assertEqual(next(users).name, "Abby")
+        users.close()
+        self.assertEqual(mapper.count(User), 5)
+
+        # Fetch only the names of the users ordered by username
+        names = mapper.filter_values(User, ["name"], "`question`=?", "Favorite animal?", order_by=["name"])
+        self.assertEqual(names, [("Abby",), ("Daniel",), ("Fiona",), ("James",), ("Leila",)])
+
+        # Ordering by a column that is not a field should be rejected
+        with self.assertRaises(InvalidParamsError):
+            mapper.filter(User, order_by=["name`; DROP TABLE `users"])
+
+        # Invalid sort orders and limits should be rejected too
+        with self.assertRaises(InvalidParamsError):
+            mapper.filter(User, order_by=["name"], order="ASC; DROP TABLE `users`")
+
+        with self.assertRaises(InvalidParamsError):
+            mapper.filter(User, limit="1; DROP TABLE `users`")
+
         # Disconnect from the database
         mapper.disconnect()
 
@@ -289,8 +321,8 @@ class TestMySQLMapper(unittest.TestCase):
         mapper.commit()
 
         # Verify that the user's posts were deleted too
-        posts = mapper.filter(Post, "`user`=?", 5)
-        self.assertEqual(len(posts), 0)
+        self.assertFalse(mapper.exists(Post, "`user`=?", 5))
+        self.assertTrue(mapper.exists(Post, "`user`=?", 1))
 
         # Disconnect from the database
         mapper.disconnect()
@@ -306,9 +338,50 @@ class TestMySQLMapper(unittest.TestCase):
         mapper.init_model(Post)
 
         # Test result counting
-        user_cnt = mapper.count(User)
-        users = mapper.filter(User)
-        self.assertEqual(user_cnt, len(users))
+        self.assertEqual(mapper.count(User), 4)
+        self.assertEqual(mapper.count(User, "`question`=?", "Favorite animal?"), 4)
+
+        # Disconnect from the database
+        mapper.disconnect()
+
+    def test_8_save_models(self):
+        """Test bulk data model saving."""
+        # Establish a database connection
+        mapper = MySQLMapper()
+        mapper.connect(host="localhost", user="tester", passwd="test", database="testing")
+
+        # Initialize data models
+        mapper.init_model(User)
+        mapper.init_model(Post)
+
+        # Create some posts and save them in bulk
+        posts = [Post(user=1, content=f"Post #{i}") for i in range(10)]
+        mapper.save_models(posts)
+        mapper.commit()
+
+        # Check model IDs
+        first_id = posts[0].id
+        self.assertEqual([post.id for post in posts], list(range(first_id, first_id + 10)))
+        self.assertEqual(mapper.filter(Post, "`id`=?", posts[9].id)[0].content, "Post #9")
+
+        # Update the posts and save them in bulk
+        for post in posts:
+            post.content = "Edited"
+
+        mapper.save_models(posts)
+        mapper.commit()
+        self.assertEqual(mapper.count(Post, "`content`=?", "Edited"), 10)
+
+        # Delete the posts in bulk
+        mapper.delete_models(posts)
+        mapper.commit()
+        self.assertEqual(mapper.count(Post, "`content`=?", "Edited"), 0)
+
+        # Delete posts matching a condition
+        mapper.save_models([Post(user=1, content="Temporary") for i in range(3)])
+        self.assertEqual(mapper.delete_filter(Post, "`content`=?", "Temporary"), 3)
+        mapper.commit()
+        self.assertFalse(mapper.exists(Post, "`content`=?", "Temporary"))
 
         # Disconnect from the database
         mapper.disconnect()
@@ -1,6 +1,7 @@
 """Cheetah ORM - SQLite Mapper Unit Tests"""
 
 from datetime import datetime
+import os
 import unittest
 
 from cheetah_orm.fields import (
@@ -14,6 +15,7 @@ from cheetah_orm.fields import (
     StringField
 )
 from cheetah_orm.indexes import ForeignKey, Index, UniqueIndex
+from cheetah_orm.error import InvalidParamsError
 from cheetah_orm.mappers import SQLiteMapper
 from cheetah_orm.model import DataModel
 
@@ -59,10 +61,25 @@ class TestSQLiteMapper(unittest.TestCase):
         # Establish a database connection
         mapper = SQLiteMapper()
         mapper.connect(database="test.db")
+        db = mapper._db
 
         # Disconnect from the database
         mapper.disconnect()
 
+        # Reconnect and check that the pooled connection is reused
+        mapper.connect(database="test.db")
+        self.assertIs(mapper._db, db)
+        mapper.disconnect()
+
+        # Replace a database file and check that the pooled connection to the old file isn't reused
+        mapper.connect(database="temp.db")
+        mapper.disconnect()
+        os.unlink("temp.db")
+        mapper.connect(database="temp.db")
+        mapper._cur.execute("CREATE TABLE `temp` (`id` INTEGER PRIMARY KEY);")
+        mapper.disconnect()
+        os.unlink("temp.db")
+
     def test_2_init_model(self):
         """Test data model initialization."""
         # Establish a database connection
@@ -173,6 +190,27 @@ class TestSQLiteMapper(unittest.TestCase):
         # Disconnect from the database
         mapper.disconnect()
 
+        # Save a data model created with the ID of an existing row and check that the row changed
+        class Point(DataModel):
+            table = "points"
+            x     = IntField()
+            y     = IntField()
+
+        mapper.connect(database=":memory:")
+        mapper.init_model(Point)
+        mapper.save_model(Point(x=1, y=2))
+        mapper.save_model(Point(id=1, x=3, y=4))
+        mapper.commit()
+        self.assertEqual(mapper.filter_values(Point, ["x", "y"]), [(3, 4)])
+
+        # Assign the ID of an existing row after creating a data model and check that saving it changes the row
+        point = Point(x=5, y=6)
+        point.id = 1
+        mapper.save_model(point)
+        mapper.commit()
+        self.assertEqual(mapper.filter_values(Point, ["x", "y"]), [(5, 6)])
+        mapper.disconnect()
+
     def test_4_delete_model(self):
         """Test data model deletion."""
         # Establish a database connection
@@ -208,6 +246,7 @@ class TestSQLiteMapper(unittest.TestCase):
         users = mapper.filter(User, "`name`=?", "Daniel")
         self.assertEqual(len(users), 1)
         self.assertEqual(users[0].name, "Daniel")
+        self.assertTrue(users[0].pswd == "lion")
 
         # Fetch Leila and Abby
         users = mapper.filter(User, "`name`=? OR `name`=?", "Leila", "Abby")
@@ -228,6 +267,31 @@ class TestSQLiteMapper(unittest.TestCase):
         self.assertEqual(users[0].name, "Daniel")
         self.assertEqual(users[1].name, "Fiona")
 
+        # Stream all users ordered by username in small chunks
+        names = [user.name for user in mapper.iter_filter(User, order_by=["name"], chunksize=2)]
+        self.assertEqual(names, [user.name for user in mapper.filter(User, order_by=["name"])])
+
+        # Stop consuming the streamed users early and check that other queries still work
+        users = mapper.iter_filter(User, order_by=["name"], chunksize=2)
+        self.assertEqual(next(users).name, "Abby")
+        users.close()
+        self.assertEqual(mapper.count(User), 5)
+
+        # Fetch only the names of the users ordered by username
+        names = mapper.filter_values(User, ["name"], "`question`=?", "Favorite animal?", order_by=["name"])
+        self.assertEqual(names, [("Abby",), ("Daniel",), ("Fiona",), ("James",), ("Leila",)])
+
+        # Ordering by a column that is not a field should be rejected
+        with self.assertRaises(InvalidParamsError):
+            mapper.filter(User, order_by=["name`; DROP TABLE `users"])
+
+        # Invalid sort orders and limits should be rejected too
+        with self.assertRaises(InvalidParamsError):
+            mapper.filter(User, order_by=["name"], order="ASC; DROP TABLE `users`")
+
+        with self.assertRaises(InvalidParamsError):
+            mapper.filter(User, limit="1; DROP TABLE `users`")
+
         # Disconnect from the database
         mapper.disconnect()
 
@@ -289,8 +353,8 @@ class TestSQLiteMapper(unittest.TestCase):
         mapper.commit()
 
         # Verify that the user's posts were deleted too
-        posts = mapper.filter(Post, "`user`=?", 5)
-        self.assertEqual(len(posts), 0)
+        self.assertFalse(mapper.exists(Post, "`user`=?", 5))
+        self.assertTrue(mapper.exists(Post, "`user`=?", 1))
 
         # Disconnect from the database
         mapper.disconnect()
@@ -306,9 +370,102 @@ class TestSQLiteMapper(unittest.TestCase):
         mapper.init_model(Post)
 
         # Test result counting
-        user_cnt = mapper.count(User)
-        users = mapper.filter(User)
-        self.assertEqual(user_cnt, len(users))
+        self.assertEqual(mapper.count(User), 4)
+        self.assertEqual(mapper.count(User, "`question`=?", "Favorite animal?"), 4)
+
+        # Disconnect from the database
+        mapper.disconnect()
+
+    def test_8_save_models(self):
+        """Test bulk data model saving."""
+        # Establish a database connection
+        mapper = SQLiteMapper()
+        mapper.connect(database="test.db")
+
+        # Initialize data models
+        mapper.init_model(User)
+        mapper.init_model(Post)
+
+        # Create some posts and save them in bulk
+        posts = [Post(user=1, content=f"Post #{i}") for i in range(10)]
+        mapper.save_models(posts)
+        mapper.commit()
+
+        # Check model IDs
+        first_id = posts[0].id
+        self.assertEqual([post.id for post in posts], list(range(first_id, first_id + 10)))
+        self.assertEqual(mapper.filter(Post, "`id`=?", posts[9].id)[0].content, "Post #9")
+
+        # Update the posts and save them in bulk
+        for post in posts:
+            post.content = "Edited"
+
+        mapper.save_models(posts)
+        mapper.commit()
+        self.assertEqual(mapper.count(Post, "`content`=?", "Edited"), 10)
+
+        # Delete the posts in bulk
+        mapper.delete_models(posts)
+        mapper.commit()
+        self.assertEqual(mapper.count(Post, "`content`=?", "Edited"), 0)
+
+        # Delete posts matching a condition
+        mapper.save_models([Post(user=1, content="Temporary") for i in range(3)])
+        self.assertEqual(mapper.delete_filter(Post, "`content`=?", "Temporary"), 3)
+        mapper.commit()
+        self.assertFalse(mapper.exists(Post, "`content`=?", "Temporary"))
+
+        # Disconnect from the database
+        mapper.disconnect()
+
+        # Assign the IDs of existing rows after creating data models and check that saving them in bulk changes 
+        # the rows
+        class Point(DataModel):
+            table = "points"
+            x     = IntField()
+            y     = IntField()
+
+        mapper.connect(database=":memory:")
+        mapper.init_model(Point)
+        mapper.save_models([Point(x=1, y=2), Point(x=3, y=4)])
+        points = [Point(x=5, y=6), Point(x=7, y=8)]
+
+        for id, point in enumerate(points, 1):
+            point.id = id
+
+        mapper.save_models(points)
+        mapper.commit()
+        self.assertEqual(mapper.filter_values(Point, ["x", "y"], order_by=["id"]), [(5, 6), (7, 8)])
+        mapper.disconnect()
+
+    def test_9_transaction(self):
+        """Test transaction blocks."""
+        # Establish a database connection
+        mapper = SQLiteMapper()
+        mapper.connect(database="test.db")
+
+        # Initialize data models
+        mapper.init_model(User)
+        mapper.init_model(Post)
+
+        # Save several posts in a committed transaction
+        cnt = mapper.count(Post)
+
+        with mapper.transaction():
+            for i in range(5):
+                mapper.save_model(Post(user=1, content=f"Transaction #{i}"))
+
+        self.assertEqual(mapper.count(Post), cnt + 5)
+
+        # Save several posts in a transaction that is rolled back
+        with self.assertRaises(ValueError):
+            with mapper.transaction():
+                for i in range(5):
+                    mapper.save_model(Post(user=1, content=f"Rollback #{i}"))
+
+                raise ValueError()
+
+        self.assertEqual(mapper.count(Post), cnt + 5)
 
         # Disconnect from the database
         mapper.disconnect()
@@ -3,9 +3,9 @@
 import unittest
 
 from cheetah_orm.fields import FloatField, IntField, StringField
-from cheetah_orm.indexes import UniqueIndex
+from cheetah_orm.indexes import Index, UniqueIndex
 from cheetah_orm.mappers import SQLiteMapper
-from cheetah_orm.migrators import SQLiteMigrator
+from cheetah_orm.migrators import MigrationMetadata, SQLiteMigrator
 from cheetah_orm.model import DataModel
 
 
@@ -18,6 +18,13 @@ class PlayerStats(DataModel):
     name_idx  = UniqueIndex("name")
 
 
+class Achievement(DataModel):
+    table    = "achievements"
+    name     = StringField(length=32, not_null=True)
+    points   = IntField(not_null=True)
+    name_idx = UniqueIndex("name")
+
+
 class TestSQLiteMigrator(unittest.TestCase):
     """SQLite migrator tests."""
     @classmethod
@@ -28,11 +35,15 @@ class TestSQLiteMigrator(unittest.TestCase):
         cls.mapper.connect(database="test.db")
 
         # Cleanup last test
-        cls.mapper._cur.execute("DROP TABLE IF EXISTS `player_stats`;")
-        cls.mapper._cur.execute("DROP TABLE IF EXISTS `migration_metadata`;")
+        cls.mapper._cur.executescript(
+            "DROP TABLE IF EXISTS `player_stats`;"
+            "DROP TABLE IF EXISTS `achievements`;"
+            "DROP TABLE IF EXISTS `migration_metadata`;"
+        )
 
         # Initialize data models
         cls.mapper.init_model(PlayerStats)
+        cls.mapper.init_model(Achievement)
 
         # Initialize migrator
         cls.migrator = SQLiteMigrator(cls.mapper)
@@ -91,3 +102,41 @@ class TestSQLiteMigrator(unittest.TestCase):
         """Test field removal."""
         # Apply migrations (this will revert back to the original data model we defined globally)
         self.migrator.migrate(PlayerStats)
+
+    def test_5_unchanged_model(self):
+        """Test skipping unchanged data models."""
+        # Apply migrations again (the data model is unchanged, so nothing should be modified)
+        changes = self.mapper._db.total_changes
+        self.migrator.migrate(PlayerStats)
+        self.assertEqual(self.mapper._db.total_changes, changes)
+
+    def test_6_migrate_many(self):
+        """Test migrating several data models at once."""
+        # Apply migrations for both data models
+        self.migrator.migrate_many([PlayerStats, Achievement])
+
+        # Check migration metadata
+        records = self.mapper.filter(MigrationMetadata, "`name` IN (?,?)", "player_stats", "achievements")
+        self.assertEqual(len(records), 2)
+
+    def test_7_add_index(self):
+        """Test normal index adding."""
+        # Redefine the achievement data model
+        class Achievement(DataModel):
+            table      = "achievements"
+            name       = StringField(length=32, not_null=True)
+            points     = IntField(not_null=True)
+            name_idx   = UniqueIndex("name")
+            points_idx = Index("points")
+
+        # Apply migrations (only the index should be created, the table should be kept)
+        self.mapper._cur.execute("SELECT `sql` FROM `sqlite_master` WHERE `name`='achievements';")
+        table_sql = self.mapper._cur.fetchone()[0]
+        self.migrator.migrate(Achievement)
+
+        # Check the table and index
+        self.mapper._cur.execute("SELECT `name`,`sql` FROM `sqlite_master` WHERE `tbl_name`='achievements';")
+        rows = dict(self.mapper._cur.fetchall())
+        self.assertEqual(rows["achievements"], table_sql)
+        self.assertIn("achievements_points_idx", rows)
+        self.assertNotIn("tmp_achievements", rows)